@@ -0,0 +1,8 @@
+"""
+各モジュールで共通に使用する設定値
+
+コマンドライン引数の解析時にも参照するため、PyMuPDFなど読み込みに時間がかかるパッケージはインポートしません。
+"""
+
+# 並列画像化のプロセス数の既定の上限（MuPDFの画像化はおよそ4プロセスで頭打ちになり、それ以上はメモリを消費するだけ）
+RENDER_WORKERS_DEFAULT_MAX = 4
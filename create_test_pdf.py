@@ -8,6 +8,9 @@ from pathlib import Path
 
 import fitz
 
+# 各ページで共有する埋め込みフォント名
+FONT_NAME = "F0"
+
 
 def create_test_pdf():
     """テスト用のPDFファイルを作成する"""
@@ -15,8 +18,12 @@ def create_test_pdf():
     # 新しいPDFドキュメントを作成
     doc = fitz.open()
 
+    # 日本語を含むテキスト用のフォントを一度だけ読み込み、全ページで使い回す
+    font = fitz.Font("cjk")
+
     # ページ1を作成
     page1 = doc.new_page(width=595, height=842)  # A4サイズ
+    page1.insert_font(fontname=FONT_NAME, fontbuffer=font.buffer)
 
     # テキストを追加
     text1 = """テスト用PDFファイル
@@ -32,10 +39,11 @@ This is a test document for PDF OCR processing.
 Testing various text elements and layouts."""
 
     # テキストを挿入
-    page1.insert_text((50, 100), text1, fontsize=12, color=(0, 0, 0))
+    page1.insert_text((50, 100), text1, fontname=FONT_NAME, fontsize=12, color=(0, 0, 0))
 
     # ページ2を作成
     page2 = doc.new_page(width=595, height=842)
+    page2.insert_font(fontname=FONT_NAME, fontbuffer=font.buffer)
 
     # テキストを追加
     text2 = """ページ2の内容
@@ -55,10 +63,10 @@ Testing various text elements and layouts."""
 日付: 2025年6月3日"""
 
     # テキストを挿入
-    page2.insert_text((50, 100), text2, fontsize=12, color=(0, 0, 0))
+    page2.insert_text((50, 100), text2, fontname=FONT_NAME, fontsize=12, color=(0, 0, 0))
 
     # 大きなタイトルを追加
-    page2.insert_text((50, 50), "ページ2のタイトル", fontsize=18, color=(0, 0, 0))
+    page2.insert_text((50, 50), "ページ2のタイトル", fontname=FONT_NAME, fontsize=18, color=(0, 0, 0))
 
     # 出力ディレクトリを確認
     input_dir = Path("input_pdfs")
@@ -66,6 +74,7 @@ Testing various text elements and layouts."""
 
     # PDFファイルを保存
     output_path = input_dir / "test_sample.pdf"
+    doc.subset_fonts()  # 使用文字のみ埋め込み、ファイルサイズを抑える
     doc.save(output_path)
     doc.close()
 
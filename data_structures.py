@@ -4,34 +4,163 @@ PDF OCR処理用のデータ構造定義
 OCR結果とPDF処理で使用する統一的なデータ構造を定義します。
 """
 
-from dataclasses import dataclass
+import importlib.util
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 
-@dataclass
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # orjsonは任意依存。未インストール時は標準のjsonを使用する
+    ORJSON_AVAILABLE = False
+
+# numbaは任意依存。未インストール時はNumPy実装を使用する
+# インポート自体に時間がかかるため、存在確認のみ行い、実際の読み込みは初回の重複削除時まで遅延する
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+def _pairwise_remove_mask(
+    bbs: np.ndarray, areas: np.ndarray, order: np.ndarray, n_larger: np.ndarray, threshold: float
+) -> np.ndarray:
+    """重複により削除すべきブロックのマスクを計算する（_get_pairwise_kernelでnopythonモードにコンパイルして使用）"""
+    n = bbs.shape[0]
+    remove_mask = np.zeros(n, dtype=np.bool_)
+
+    for i in range(n):
+        area_i = areas[i]
+        if area_i <= 0:
+            continue
+
+        # 面積の降順で先頭n_larger[i]個が自身より大きいブロック（削除の原因になり得る候補）
+        for k in range(n_larger[i]):
+            j = order[k]
+            iw = min(bbs[i, 2], bbs[j, 2]) - max(bbs[i, 0], bbs[j, 0])
+            ih = min(bbs[i, 3], bbs[j, 3]) - max(bbs[i, 1], bbs[j, 1])
+            if iw <= 0 or ih <= 0:
+                continue
+
+            if iw * ih / area_i >= threshold:
+                remove_mask[i] = True
+                break
+
+    return remove_mask
+
+
+@lru_cache(maxsize=None)
+def _get_pairwise_kernel() -> Optional[Callable[..., np.ndarray]]:
+    """_pairwise_remove_maskをJITコンパイルして返す（numbaを読み込めない場合はNone）"""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_pairwise_remove_mask)
+
+
+# 大きなブロックとの重複判定を行う際に一度に計算する行数（一時配列のメモリ使用量を抑えるため）
+_OVERLAP_CHUNK_ROWS = 256
+
+
+def _mark_overlapped_blocks(
+    bbs: np.ndarray, areas: np.ndarray, rows: np.ndarray, cand: np.ndarray, threshold: float, remove_mask: np.ndarray
+) -> None:
+    """rowsの各ブロックについて、candのうち自身より大きいブロックとの重複率が閾値以上なら削除対象にする"""
+    row_bbs = bbs[rows]
+    cand_bbs = bbs[cand]
+    iw = np.minimum(row_bbs[:, None, 2], cand_bbs[None, :, 2]) - np.maximum(row_bbs[:, None, 0], cand_bbs[None, :, 0])
+    ih = np.minimum(row_bbs[:, None, 3], cand_bbs[None, :, 3]) - np.maximum(row_bbs[:, None, 1], cand_bbs[None, :, 1])
+    inter = np.clip(iw, 0, None) * np.clip(ih, 0, None)
+
+    row_areas = areas[rows][:, None]
+    ratio = np.zeros_like(inter)
+    np.divide(inter, row_areas, out=ratio, where=row_areas > 0)
+
+    overlapped = (ratio >= threshold) & (row_areas < areas[cand][None, :])
+    remove_mask[rows] |= overlapped.any(axis=1)
+
+
+def _larger_block_order(areas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    面積の降順に並べたインデックスと、各ブロックより面積が厳密に大きいブロック数を返す
+
+    order[:n_larger[i]] がブロックiより大きいブロックの集合となるため、
+    重複判定の候補をこの範囲に限定できます。
+    """
+    order = np.argsort(-areas, kind="stable")
+    n_larger = np.searchsorted(-areas[order], -areas, side="left")
+    return order, n_larger
+
+
+def _bucket_remove_mask(
+    bbs: np.ndarray, areas: np.ndarray, order: np.ndarray, n_larger: np.ndarray, threshold: float
+) -> np.ndarray:
+    """
+    中心座標のハッシュによるクラスタリングを用いて重複により削除すべきブロックのマスクを計算する
+
+    幅・高さが共にセルサイズQ以下のブロック同士が重なる場合、中心座標の差は各軸でQ以下になるため、
+    中心座標をQで量子化したバケットとその8近傍のみを比較すれば十分となる。
+    Qを超える大きなブロック（段落など）は少数のため、全ブロックとまとめて比較する。
+    """
+    n = len(bbs)
+    widths = bbs[:, 2] - bbs[:, 0]
+    heights = bbs[:, 3] - bbs[:, 1]
+    q = max(float(np.median(widths)), float(np.median(heights)), 32.0)
+
+    large = (widths > q) | (heights > q)
+    large_idx = np.flatnonzero(large)
+
+    # 1段目: 小さなブロックを中心座標のバケットに分類
+    centers = np.column_stack(((bbs[:, 0] + bbs[:, 2]) / 2, (bbs[:, 1] + bbs[:, 3]) / 2))
+    keys = np.floor_divide(centers, q).astype(np.int64).tolist()
+    buckets = defaultdict(list)
+    for i in np.flatnonzero(~large).tolist():
+        buckets[tuple(keys[i])].append(i)
+
+    remove_mask = np.zeros(n, dtype=bool)
+
+    # 2段目: バケットごとに、8近傍を含む候補と大きなブロックに対してまとめて重複判定
+    for (kx, ky), members in buckets.items():
+        neighbors = [j for dx in (-1, 0, 1) for dy in (-1, 0, 1) for j in buckets.get((kx + dx, ky + dy), ())]
+        cand = np.concatenate((np.array(neighbors, dtype=np.intp), large_idx))
+        _mark_overlapped_blocks(bbs, areas, np.array(members, dtype=np.intp), cand, threshold, remove_mask)
+
+    # 大きなブロック自身は、自身より大きい全ブロックと比較
+    # 面積の降順に処理することで、各チャンクの候補を面積上位の範囲に絞り込む
+    large_idx = large_idx[np.argsort(-areas[large_idx], kind="stable")]
+    for start in range(0, len(large_idx), _OVERLAP_CHUNK_ROWS):
+        rows = large_idx[start : start + _OVERLAP_CHUNK_ROWS]
+        cand = order[: n_larger[rows].max()]
+        if len(cand):
+            _mark_overlapped_blocks(bbs, areas, rows, cand, threshold, remove_mask)
+
+    return remove_mask
+
+
+@dataclass(frozen=True, slots=True)
 class BoundingBox:
-    """バウンディングボックスを表すデータクラス"""
+    """バウンディングボックスを表すデータクラス（不変。幅・高さ・面積は生成時に計算）"""
 
     x0: float  # 左上X座標
     y0: float  # 左上Y座標
     x1: float  # 右下X座標
     y1: float  # 右下Y座標
+    width: float = field(init=False, repr=False, compare=False)  # 幅
+    height: float = field(init=False, repr=False, compare=False)  # 高さ
+    area: float = field(init=False, repr=False, compare=False)  # 面積
 
-    @property
-    def width(self) -> float:
-        """幅を計算"""
-        return self.x1 - self.x0
-
-    @property
-    def height(self) -> float:
-        """高さを計算"""
-        return self.y1 - self.y0
-
-    @property
-    def area(self) -> float:
-        """面積を計算"""
-        return self.width * self.height
+    def __post_init__(self) -> None:
+        width = self.x1 - self.x0
+        height = self.y1 - self.y0
+        object.__setattr__(self, "width", width)
+        object.__setattr__(self, "height", height)
+        object.__setattr__(self, "area", width * height)
 
     @property
     def center(self) -> Tuple[float, float]:
@@ -72,7 +201,7 @@ class BoundingBox:
         return cls(coords[0], coords[1], coords[2], coords[3])
 
 
-@dataclass
+@dataclass(slots=True)
 class TextBlock:
     """OCRで検出されたテキストブロックを表すデータクラス"""
 
@@ -103,35 +232,178 @@ class TextBlock:
             block_id=data.get("block_id"),
         )
 
+    def to_tuple(self) -> Tuple[str, float, float, float, float, float, str, Optional[int]]:
+        """タプル形式で返す (text, x0, y0, x1, y1, confidence, direction, block_id)"""
+        bbox = self.bbox
+        return (self.text, bbox.x0, bbox.y0, bbox.x1, bbox.y1, self.confidence, self.direction, self.block_id)
+
+    @classmethod
+    def from_tuple(cls, data: Tuple[str, float, float, float, float, float, str, Optional[int]]) -> "TextBlock":
+        """タプルからTextBlockを作成"""
+        text, x0, y0, x1, y1, confidence, direction, block_id = data
+        return cls(text, BoundingBox(x0, y0, x1, y1), confidence, direction, block_id)
+
+
+# 座標・信頼度配列の型（ページ座標は数万ピクセル未満のため単精度で十分）
+_FLOAT_DTYPE = np.float32
+
+
+def _stack_bboxes(coords_list: List[List[float]]) -> np.ndarray:
+    """bbox座標のリストを (N, 4) 配列にまとめる"""
+    if not coords_list:
+        return _empty_bboxes()
+    try:
+        bboxes = np.array(coords_list, dtype=_FLOAT_DTYPE)
+    except ValueError as e:
+        raise ValueError(f"座標は4つの値が必要です: {e}") from e
+    if bboxes.ndim != 2 or bboxes.shape[1] != 4:
+        raise ValueError(f"座標は4つの値が必要です: shape={bboxes.shape}")
+    return bboxes
+
+
+def _empty_bboxes() -> np.ndarray:
+    return np.empty((0, 4), dtype=_FLOAT_DTYPE)
+
+
+def _empty_confidences() -> np.ndarray:
+    return np.empty(0, dtype=_FLOAT_DTYPE)
+
 
 @dataclass
 class PageOCRResult:
-    """1ページのOCR結果を表すデータクラス"""
+    """
+    1ページのOCR結果を表すデータクラス
+
+    テキストブロックはブロックごとのオブジェクトではなく、列ごとの配列（SoA）として保持します。
+    TextBlockオブジェクトが必要な場合は text_blocks プロパティで都度生成します。
+    """
 
     page_number: int  # ページ番号 (1から開始)
-    text_blocks: List[TextBlock]  # テキストブロックのリスト
     page_width: float  # ページ幅 (ピクセル)
     page_height: float  # ページ高さ (ピクセル)
     success: bool = True  # 処理成功フラグ
     error: Optional[str] = None  # エラーメッセージ
     processing_time: float = 0.0  # 処理時間（秒）
+    bboxes: np.ndarray = field(default_factory=_empty_bboxes, compare=False)  # (N, 4) [x0, y0, x1, y1]
+    confidences: np.ndarray = field(default_factory=_empty_confidences, compare=False)  # (N,) 信頼度
+    texts: List[str] = field(default_factory=list)  # テキスト内容
+    directions: List[str] = field(default_factory=list)  # テキスト方向
+    block_ids: List[Optional[int]] = field(default_factory=list)  # ブロックID
+
+    @classmethod
+    def from_text_blocks(
+        cls,
+        page_number: int,
+        text_blocks: List[TextBlock],
+        page_width: float,
+        page_height: float,
+        success: bool = True,
+        error: Optional[str] = None,
+        processing_time: float = 0.0,
+    ) -> "PageOCRResult":
+        """TextBlockのリストからPageOCRResultを作成"""
+        result = cls(
+            page_number=page_number,
+            page_width=page_width,
+            page_height=page_height,
+            success=success,
+            error=error,
+            processing_time=processing_time,
+        )
+        result.text_blocks = text_blocks
+        return result
+
+    @classmethod
+    def from_columns(
+        cls,
+        page_number: int,
+        texts: List[str],
+        bboxes: Any,
+        confidences: Any,
+        directions: List[str],
+        page_width: float,
+        page_height: float,
+        success: bool = True,
+        error: Optional[str] = None,
+        processing_time: float = 0.0,
+    ) -> "PageOCRResult":
+        """列ごとの配列からPageOCRResultを作成（ブロックIDは1からの連番）"""
+        count = len(texts)
+        bboxes = np.asarray(bboxes, dtype=_FLOAT_DTYPE).reshape(-1, 4)
+        confidences = np.asarray(confidences, dtype=_FLOAT_DTYPE)
+        if len(bboxes) != count or len(confidences) != count or len(directions) != count:
+            raise ValueError(
+                f"列の長さが一致しません: texts={count}, bboxes={len(bboxes)}, "
+                f"confidences={len(confidences)}, directions={len(directions)}"
+            )
+        return cls(
+            page_number=page_number,
+            page_width=page_width,
+            page_height=page_height,
+            success=success,
+            error=error,
+            processing_time=processing_time,
+            bboxes=bboxes,
+            confidences=confidences,
+            texts=list(texts),
+            directions=list(directions),
+            block_ids=list(range(1, count + 1)),
+        )
 
     @property
+    def text_blocks(self) -> List[TextBlock]:
+        """
+        TextBlockのリストを生成して返す
+
+        戻り値は配列から都度生成されるコピーのため、要素を変更しても本オブジェクトには反映されません。
+        変更を反映する場合は text_blocks に再代入してください。
+        """
+        return [
+            TextBlock(
+                text=text,
+                bbox=BoundingBox(*coords),
+                confidence=confidence,
+                direction=direction,
+                block_id=block_id,
+            )
+            for text, coords, confidence, direction, block_id in zip(
+                self.texts, self.bboxes.tolist(), self.confidences.tolist(), self.directions, self.block_ids
+            )
+        ]
+
+    @text_blocks.setter
+    def text_blocks(self, text_blocks: List[TextBlock]) -> None:
+        """TextBlockのリストから各配列を設定"""
+        self.bboxes = np.array(
+            [[b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1] for b in text_blocks], dtype=_FLOAT_DTYPE
+        ).reshape(-1, 4)
+        self.confidences = np.array([b.confidence for b in text_blocks], dtype=_FLOAT_DTYPE)
+        self.texts = [b.text for b in text_blocks]
+        self.directions = [b.direction for b in text_blocks]
+        self.block_ids = [b.block_id for b in text_blocks]
+        self._invalidate_cache()
+
+    def _invalidate_cache(self) -> None:
+        """テキストブロック変更時にキャッシュ済みの集計値を破棄"""
+        for name in ("total_text", "text_count", "average_confidence"):
+            self.__dict__.pop(name, None)
+
+    @cached_property
     def total_text(self) -> str:
         """全テキストを結合して返す"""
-        return " ".join(block.text for block in self.text_blocks)
+        return " ".join(self.texts)
 
-    @property
+    @cached_property
     def text_count(self) -> int:
         """テキストブロック数を返す"""
-        return len(self.text_blocks)
+        return len(self.texts)
 
-    @property
+    @cached_property
     def average_confidence(self) -> float:
         """平均信頼度を計算"""
-        if not self.text_blocks:
+        if not self.texts:
             return 0.0
-        return sum(block.confidence for block in self.text_blocks) / len(self.text_blocks)
+        return float(self.confidences.mean())
 
     def remove_duplicate_blocks(self, overlap_threshold: float = 0.6) -> int:
         """
@@ -142,44 +414,45 @@ class PageOCRResult:
         - その重複しているテキストブロックよりも自身のbboxが小さい
 
         Args:
-            overlap_threshold: 重複判定の閾値（デフォルト: 0.6 = 60%）
+            overlap_threshold: 重複判定の閾値（0より大きい値、デフォルト: 0.6 = 60%）
 
         Returns:
             削除されたブロック数
         """
-        if len(self.text_blocks) <= 1:
-            return 0
-
-        blocks_to_remove = set()
+        # 閾値が0以下の場合は重ならないブロック同士まで重複とみなすことになり、判定が意味をなさない
+        if not overlap_threshold > 0:
+            raise ValueError(f"重複判定の閾値は0より大きい値を指定してください: {overlap_threshold}")
 
-        for i, block_a in enumerate(self.text_blocks):
-            if i in blocks_to_remove:
-                continue
-
-            for j, block_b in enumerate(self.text_blocks):
-                if i == j or j in blocks_to_remove:
-                    continue
-
-                # block_aがblock_bと重複しているかチェック
-                overlap_ratio = block_a.bbox.overlap_ratio(block_b.bbox)
-
-                # 重複率が閾値を超え、かつblock_aの方が小さい場合
-                if overlap_ratio >= overlap_threshold and block_a.bbox.area < block_b.bbox.area:
-                    blocks_to_remove.add(i)
-                    break
-
-        # 削除対象のブロックを除外した新しいリストを作成
-        original_count = len(self.text_blocks)
-        self.text_blocks = [block for i, block in enumerate(self.text_blocks) if i not in blocks_to_remove]
+        if self.text_count <= 1:
+            return 0
 
-        removed_count = original_count - len(self.text_blocks)
+        bbs = np.ascontiguousarray(self.bboxes, dtype=_FLOAT_DTYPE)
+        areas = (bbs[:, 2] - bbs[:, 0]) * (bbs[:, 3] - bbs[:, 1])
+
+        order, n_larger = _larger_block_order(areas)
+
+        kernel = _get_pairwise_kernel() if NUMBA_AVAILABLE else None
+        if kernel is not None:
+            # JITコンパイル済みカーネルで自身より大きいブロックとの組のみを判定
+            remove_mask = kernel(bbs, areas, order, n_larger, overlap_threshold)
+        else:
+            remove_mask = _bucket_remove_mask(bbs, areas, order, n_larger, overlap_threshold)
+
+        # 削除対象のブロックを除外
+        original_count = self.text_count
+        keep = ~remove_mask
+        self.bboxes = self.bboxes[keep]
+        self.confidences = self.confidences[keep]
+        self.texts = [text for text, k in zip(self.texts, keep) if k]
+        self.directions = [direction for direction, k in zip(self.directions, keep) if k]
+        self.block_ids = [block_id for block_id, k in zip(self.block_ids, keep) if k]
+        self._invalidate_cache()
+
+        removed_count = original_count - self.text_count
         return removed_count
 
-    def to_dict(self) -> Dict[str, Any]:
-        """辞書形式で返す"""
+    def _summary_dict(self) -> Dict[str, Any]:
         return {
-            "page_number": self.page_number,
-            "text_blocks": [block.to_dict() for block in self.text_blocks],
             "page_width": self.page_width,
             "page_height": self.page_height,
             "success": self.success,
@@ -190,17 +463,77 @@ class PageOCRResult:
             "average_confidence": self.average_confidence,
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        辞書形式で返す
+
+        テキストブロックは列ごとにまとめた "blocks" として出力します。
+        bboxes と confidences はNumPy配列のまま格納されるため、orjson の OPT_SERIALIZE_NUMPY 等で直列化してください。
+        """
+        return {
+            "page_number": self.page_number,
+            "blocks": {
+                "texts": self.texts,
+                "bboxes": self.bboxes,
+                "confidences": self.confidences,
+                "directions": self.directions,
+                "block_ids": self.block_ids,
+            },
+            **self._summary_dict(),
+        }
+
+    def to_dict_legacy(self) -> Dict[str, Any]:
+        """テキストブロックごとの辞書のリスト "text_blocks" を含む従来の辞書形式で返す"""
+        return {
+            "page_number": self.page_number,
+            "text_blocks": [
+                {
+                    "text": text,
+                    "bbox": coords,
+                    "confidence": confidence,
+                    "direction": direction,
+                    "block_id": block_id,
+                }
+                for text, coords, confidence, direction, block_id in zip(
+                    self.texts, self.bboxes.tolist(), self.confidences.tolist(), self.directions, self.block_ids
+                )
+            ],
+            **self._summary_dict(),
+        }
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PageOCRResult":
-        """辞書からPageOCRResultを作成"""
+        """辞書からPageOCRResultを作成（列形式 "blocks" と従来形式 "text_blocks" の両方に対応）"""
+        if "blocks" in data:
+            columns = data["blocks"]
+            count = len(columns["texts"])
+            bboxes = np.array(columns["bboxes"], dtype=_FLOAT_DTYPE).reshape(-1, 4)
+            if len(bboxes) != count:
+                raise ValueError(f"bboxesの数がテキスト数と一致しません: {len(bboxes)} != {count}")
+            confidences = np.array(columns["confidences"], dtype=_FLOAT_DTYPE)
+            texts = list(columns["texts"])
+            directions = list(columns.get("directions", ["horizontal"] * count))
+            block_ids = list(columns.get("block_ids", [None] * count))
+        else:
+            blocks = data["text_blocks"]
+            bboxes = _stack_bboxes([block["bbox"] for block in blocks])
+            confidences = np.array([block["confidence"] for block in blocks], dtype=_FLOAT_DTYPE)
+            texts = [block["text"] for block in blocks]
+            directions = [block.get("direction", "horizontal") for block in blocks]
+            block_ids = [block.get("block_id") for block in blocks]
+
         return cls(
             page_number=data["page_number"],
-            text_blocks=[TextBlock.from_dict(block) for block in data["text_blocks"]],
             page_width=data["page_width"],
             page_height=data["page_height"],
             success=data.get("success", True),
             error=data.get("error"),
             processing_time=data.get("processing_time", 0.0),
+            bboxes=bboxes,
+            confidences=confidences,
+            texts=texts,
+            directions=directions,
+            block_ids=block_ids,
         )
 
 
@@ -213,6 +546,7 @@ class DocumentOCRResult:
     total_processing_time: float = 0.0  # 総処理時間
     device_used: str = "cpu"  # 使用デバイス
     dpi: int = 300  # DPI設定
+    source_fingerprint: Optional[Dict[str, int]] = None  # 入力PDFの識別情報（キャッシュ検証用）
 
     @property
     def total_pages(self) -> int:
@@ -247,7 +581,7 @@ class DocumentOCRResult:
         removed_counts = {}
 
         for page in self.pages:
-            if page.success and page.text_blocks:
+            if page.success and page.text_count:
                 removed_count = page.remove_duplicate_blocks(overlap_threshold)
                 if removed_count > 0:
                     removed_counts[page.page_number] = removed_count
@@ -262,6 +596,7 @@ class DocumentOCRResult:
             "total_processing_time": self.total_processing_time,
             "device_used": self.device_used,
             "dpi": self.dpi,
+            "source_fingerprint": self.source_fingerprint,
             "summary": {
                 "total_pages": self.total_pages,
                 "successful_pages": self.successful_pages,
@@ -279,9 +614,20 @@ class DocumentOCRResult:
             total_processing_time=data.get("total_processing_time", 0.0),
             device_used=data.get("device_used", "cpu"),
             dpi=data.get("dpi", 300),
+            source_fingerprint=data.get("source_fingerprint"),
         )
 
 
+def create_source_fingerprint(input_path: Path, dpi: int) -> Dict[str, int]:
+    """
+    入力PDFの識別情報を作成する
+
+    ファイルの更新時刻・サイズとDPI設定の組を、保存済みOCR結果が現在の入力に対応しているかの判定に用います。
+    """
+    stat = input_path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "dpi": dpi}
+
+
 def convert_legacy_ocr_result(
     page_number: int,
     text_blocks: List[Dict[str, Any]],
@@ -306,21 +652,15 @@ def convert_legacy_ocr_result(
     Returns:
         PageOCRResult: 変換されたOCR結果
     """
-    converted_blocks = []
-
-    for i, block in enumerate(text_blocks):
-        text_block = TextBlock(
-            text=block["text"],
-            bbox=BoundingBox.from_list(block["bbox"]),
-            confidence=block["confidence"],
-            direction=block.get("direction", "horizontal"),
-            block_id=i + 1,
-        )
-        converted_blocks.append(text_block)
+    count = len(text_blocks)
 
-    return PageOCRResult(
+    # TextBlockを経由せず、各列を一括で配列化して直接PageOCRResultを構築する
+    return PageOCRResult.from_columns(
         page_number=page_number,
-        text_blocks=converted_blocks,
+        texts=[block["text"] for block in text_blocks],
+        bboxes=_stack_bboxes([block["bbox"] for block in text_blocks]),
+        confidences=np.fromiter((block["confidence"] for block in text_blocks), dtype=_FLOAT_DTYPE, count=count),
+        directions=[block.get("direction", "horizontal") for block in text_blocks],
         page_width=page_width,
         page_height=page_height,
         success=success,
@@ -329,21 +669,183 @@ def convert_legacy_ocr_result(
     )
 
 
+def _to_json_compatible(obj: Any) -> Any:
+    """標準のjsonで直列化できないNumPy配列・スカラーを変換する"""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == np.float32:
+            # 単精度の値を倍精度の近似値（0.8999999761581421など）ではなく最短表現で出力する
+            return obj.astype(str).astype(np.float64).tolist()
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"JSONに変換できない型です: {type(obj)}")
+
+
 def save_ocr_results(results: DocumentOCRResult, output_path: Path) -> None:
     """OCR結果をJSONファイルに保存"""
-    import json
-
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    if ORJSON_AVAILABLE:
+        output_path.write_bytes(
+            orjson.dumps(
+                results.to_dict(),
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+        )
+        return
+
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results.to_dict(), f, ensure_ascii=False, indent=2)
+        json.dump(results.to_dict(), f, ensure_ascii=False, indent=2, default=_to_json_compatible)
 
 
 def load_ocr_results(input_path: Path) -> DocumentOCRResult:
     """JSONファイルからOCR結果を読み込み"""
-    import json
+    if ORJSON_AVAILABLE:
+        data = orjson.loads(input_path.read_bytes())
+    else:
+        with open(input_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    return DocumentOCRResult.from_dict(data)
+
+
+def _dumps_line(obj: Any) -> str:
+    """改行を含まない1行のJSON文字列に変換"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=_to_json_compatible)
+
+
+def _loads(line: str) -> Any:
+    """1行のJSON文字列を読み込む"""
+    return orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+
+
+# 逐次書き出し形式のヘッダー行の末尾（この行の後に1行1ページでページ情報が続く）
+_STREAM_PAGES_OPEN = '"pages": ['
+
+
+class OCRResultsWriter:
+    """
+    OCR結果をページ単位で逐次JSONファイルに書き出すクラス
+
+    全ページの結果をメモリに保持せず、OCR処理の完了したページから順に書き出します。
+    出力は1行に1ページずつ並べた通常のJSONのため、load_ocr_resultsでも読み込めます。
+    書き出し中は一時ファイルに出力し、close時に出力先へ置き換えます。
+    """
 
+    def __init__(
+        self,
+        output_path: Path,
+        input_file: Path,
+        device_used: str = "cpu",
+        dpi: int = 300,
+        source_fingerprint: Optional[Dict[str, int]] = None,
+    ):
+        self.output_path = output_path
+        self.total_pages = 0
+        self.successful_pages = 0
+        self.total_text_blocks = 0
+        self.document_length = 0
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = output_path.with_name(output_path.name + ".tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+
+        header = {
+            "input_file": str(input_file),
+            "device_used": device_used,
+            "dpi": dpi,
+            "source_fingerprint": source_fingerprint,
+        }
+        self._file.write(_dumps_line(header)[:-1] + ", " + _STREAM_PAGES_OPEN + "\n")
+
+    def __enter__(self) -> "OCRResultsWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # 正常終了しなかった場合は書きかけの一時ファイルを破棄する
+        if not self._file.closed:
+            self._file.close()
+            self._tmp_path.unlink(missing_ok=True)
+
+    def write_page(self, page: PageOCRResult) -> None:
+        """1ページ分の結果を書き出す"""
+        if self.total_pages:
+            self._file.write(",\n")
+        self._file.write(_dumps_line(page.to_dict()))
+
+        # 文書全体の統計はDocumentOCRResultの同名プロパティと同じ値になるよう逐次集計する
+        if page.success:
+            if self.successful_pages:
+                self.document_length += 2  # ページ間の区切り "\n\n"
+            self.document_length += len(page.total_text)
+            self.successful_pages += 1
+        self.total_text_blocks += page.text_count
+        self.total_pages += 1
+
+    @property
+    def summary(self) -> Dict[str, int]:
+        """書き出し済みページの統計情報"""
+        return {
+            "total_pages": self.total_pages,
+            "successful_pages": self.successful_pages,
+            "total_text_blocks": self.total_text_blocks,
+            "document_length": self.document_length,
+        }
+
+    def close(self, total_processing_time: float = 0.0) -> None:
+        """フッターを書き出してファイルを確定する"""
+        footer = {"total_processing_time": total_processing_time, "summary": self.summary}
+        self._file.write("\n], " + _dumps_line(footer)[1:] + "\n")
+        self._file.close()
+        self._tmp_path.replace(self.output_path)
+
+
+def read_ocr_results_metadata(input_path: Path) -> Dict[str, Any]:
+    """
+    JSONファイルからページ以外のOCR結果情報（入力ファイル・識別情報・統計など）を読み込む
+
+    OCRResultsWriterで書き出したファイルは先頭行と末尾行のみを読むため、ページ数によらず短時間で完了します。
+    それ以外の形式のファイルは全体を読み込みます。
+    """
+    with open(input_path, "rb") as f:
+        header = f.readline().decode("utf-8").rstrip()
+        if header.endswith(_STREAM_PAGES_OPEN):
+            # フッター行は統計情報のみで短いため、ファイル末尾の一定範囲から探す
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 4096))
+            footer = f.read().decode("utf-8", errors="ignore").rstrip().rsplit("\n", 1)[-1]
+            metadata = _loads(header[: -len(_STREAM_PAGES_OPEN)].rstrip().rstrip(",") + "}")
+            if footer.startswith("], "):
+                metadata.update(_loads("{" + footer[3:]))
+            return metadata
+
+    if ORJSON_AVAILABLE:
+        data = orjson.loads(input_path.read_bytes())
+    else:
+        with open(input_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    data.pop("pages", None)
+    return data
+
+
+def iter_ocr_result_pages(input_path: Path) -> Iterator[PageOCRResult]:
+    """
+    JSONファイルからOCR結果をページ単位で読み込む
+
+    OCRResultsWriterで書き出したファイルは1ページずつ読み込むため、全ページを同時にメモリに保持しません。
+    それ以外の形式のファイルは全体を読み込んでからページを返します。
+    """
     with open(input_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        if f.readline().rstrip().endswith(_STREAM_PAGES_OPEN):
+            for line in f:
+                line = line.rstrip()
+                if not line:
+                    continue
+                if line.startswith("]"):
+                    return
+                yield PageOCRResult.from_dict(_loads(line.rstrip(",")))
+            return
 
-    return DocumentOCRResult.from_dict(data)
+    yield from load_ocr_results(input_path).pages
@@ -10,15 +10,28 @@ PDF OCR & Text Overlay Tool (Memory Optimized)
 import argparse
 import gc
 import logging
+import os
 import sys
+import tempfile
 import time
 from pathlib import Path
-
-from data_structures import BoundingBox, DocumentOCRResult, PageOCRResult, TextBlock, load_ocr_results, save_ocr_results
-from ocr_processor import OCRProcessor, parse_ocr_results
-from pdf_processor import convert_single_page_to_image, create_memory_efficient_searchable_pdf, get_pdf_info
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from constants import RENDER_WORKERS_DEFAULT_MAX
+from data_structures import (
+    DocumentOCRResult,
+    OCRResultsWriter,
+    PageOCRResult,
+    create_source_fingerprint,
+    iter_ocr_result_pages,
+    load_ocr_results,
+    read_ocr_results_metadata,
+)
 from simple_memory_monitor import SimpleMemoryMonitor, check_memory_availability, get_optimal_batch_size
-from text_block_sorter import sort_document_text_blocks
+from text_block_sorter import iter_sorted_pages, sort_text_blocks_by_reading_order
+
+# 全ページOCR処理中に完全なガベージコレクションを実行する間隔（ページ数）
+GC_INTERVAL_PAGES = 25
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -31,6 +44,39 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
 
+def _overlap_threshold(value: str) -> float:
+    """重複判定の閾値を解析する（0より大きく1以下の値のみ受け付ける）"""
+    try:
+        threshold = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"数値を指定してください: {value}")
+    if not 0.0 < threshold <= 1.0:
+        raise argparse.ArgumentTypeError(f"0より大きく1以下の値を指定してください: {value}")
+    return threshold
+
+
+def _jpeg_quality(value: str) -> int:
+    """ページ画像のJPEG品質を解析する（0〜100の整数のみ受け付ける）"""
+    try:
+        quality = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"整数を指定してください: {value}")
+    if not 0 <= quality <= 100:
+        raise argparse.ArgumentTypeError(f"0から100の値を指定してください: {value}")
+    return quality
+
+
+def _render_workers(value: str) -> int:
+    """画像化に使用するプロセス数を解析する（1以上の整数のみ受け付ける）"""
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"整数を指定してください: {value}")
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"1以上の値を指定してください: {value}")
+    return workers
+
+
 def parse_arguments() -> argparse.Namespace:
     """コマンドライン引数を解析する"""
     parser = argparse.ArgumentParser(
@@ -77,11 +123,56 @@ def parse_arguments() -> argparse.Namespace:
         help="OCR処理のみ実行し、検索可能なPDFは作成しない",
     )
 
+    parser.add_argument(
+        "--skip-ocr",
+        action="store_true",
+        help="OCR処理を実行せず、PDFファイルの検証と情報取得のみ行う（保存済みOCR結果があれば検索可能なPDFを作成）",
+    )
+
+    parser.add_argument(
+        "--jpeg-quality",
+        type=_jpeg_quality,
+        default=85,
+        help="検索可能なPDFに埋め込むページ画像のJPEG品質（1-100、0で可逆圧縮、デフォルト: 85）",
+    )
+
+    parser.add_argument(
+        "--colorspace",
+        choices=["rgb", "gray", "auto"],
+        default="rgb",
+        help="ページを画像化する際の色空間（gray: グレースケール、auto: ページごとに自動判定、デフォルト: rgb）",
+    )
+
+    parser.add_argument(
+        "--half-precision",
+        action="store_true",
+        help="CUDA使用時にOCRの推論をfloat16の混合精度で実行する（高速化するが、認識結果が変わる可能性がある）",
+    )
+
+    parser.add_argument(
+        "--skip-blank-pages",
+        action="store_true",
+        help="白紙と判定したページのOCR処理を省略する（スキップしたページはログに出力される）",
+    )
+
+    parser.add_argument(
+        "--fast-save",
+        action="store_true",
+        help="検索可能なPDFを高速に保存する（重複オブジェクトの統合などを省略するため、ファイルサイズがやや大きくなる）",
+    )
+
+    parser.add_argument(
+        "--render-workers",
+        type=_render_workers,
+        default=None,
+        help=f"ページの画像化に使用するプロセス数（1で並列化なし、デフォルト: CPUコア数-1、最大{RENDER_WORKERS_DEFAULT_MAX}）",
+    )
+
     parser.add_argument(
         "--overlap-threshold",
-        type=float,
+        type=_overlap_threshold,
         default=0.6,
-        help="重複テキストブロック削除の閾値（0.0-1.0、デフォルト: 0.6 = 60%）",
+        help="重複テキストブロック削除の閾値（0より大きく1以下、デフォルト: 0.6 = 60%%）",
     )
 
     return parser.parse_args()
@@ -121,13 +212,16 @@ def generate_output_filename(input_path: Path, output_dir: Path) -> Path:
     return output_dir / output_filename
 
 
-def test_ocr_processing(pixmap, device: str, logger) -> None:
+def test_ocr_processing(pixmap, device: str, logger, half_precision: bool = False) -> None:
     """OCR機能のテスト実行"""
+    # yomitoku/PyTorchの読み込みは時間がかかるため、OCRを実行する場合のみインポートする
+    from ocr_processor import OCRProcessor, parse_ocr_results
+
     try:
         logger.info("OCRProcessorを初期化中...")
 
         # OCRProcessorを作成（可視化有効でテスト）
-        ocr_processor = OCRProcessor(device=device, visualize=True)
+        ocr_processor = OCRProcessor(device=device, visualize=True, half_precision=half_precision)
 
         logger.info("OCR処理を実行中...")
         ocr_result = ocr_processor.perform_ocr(pixmap)
@@ -158,10 +252,111 @@ def test_ocr_processing(pixmap, device: str, logger) -> None:
         logger.error(f"OCRテスト中にエラーが発生しました: {e}")
 
 
+def _iter_rendered_pages(
+    input_path: Path,
+    pdf_document,
+    total_pages: int,
+    dpi: int,
+    render_workers: int = 1,
+    colorspace: str = "rgb",
+) -> Iterator[Tuple[int, Any, Optional[Exception]]]:
+    """
+    全ページを順に画像化し、(ページ番号, Pixmap, 例外) を返す
+
+    画像化はinput_pathを開いたワーカープロセス（render_workers個）で数ページ先まで先行して行い、OCR処理と並行させます。
+    PyMuPDFはマルチスレッドでの使用に対応していないため、スレッドは使用せず、
+    このプロセス内のPyMuPDFの処理は呼び出し元のスレッドのみで行います。
+    pdf_documentがファイルの内容と一致しない（メモリ上で変更されているなど）場合は、pdf_documentから順に画像化します。
+    """
+    from pdf_processor import can_reopen_from_file, render_page_to_image, render_pages_in_parallel
+
+    if can_reopen_from_file(pdf_document):
+        yield from render_pages_in_parallel(input_path, range(total_pages), dpi, render_workers, colorspace)
+        return
+
+    for page_num in range(total_pages):
+        try:
+            yield page_num, render_page_to_image(pdf_document, page_num, dpi, colorspace), None
+        except Exception as e:
+            yield page_num, None, e
+
+
+def _default_render_workers(total_pages: int) -> int:
+    """画像化に使用するプロセス数の既定値（OCR処理用にCPUコアを1つ残す）"""
+    return max(1, min(RENDER_WORKERS_DEFAULT_MAX, (os.cpu_count() or 1) - 1, total_pages))
+
+
 def perform_memory_efficient_ocr(
-    input_path: Path, device: str, dpi: int, logger, overlap_threshold: float = 0.6
+    input_path: Path,
+    device: str,
+    dpi: int,
+    logger,
+    overlap_threshold: float = 0.6,
+    *,
+    pdf_document=None,
+    render_workers: Optional[int] = None,
+    colorspace: str = "rgb",
+    half_precision: bool = False,
+    skip_blank_pages: bool = False,
 ) -> DocumentOCRResult:
-    """メモリ効率的なOCR処理を実行"""
+    """
+    メモリ効率的なOCR処理を実行し、全ページの結果を返す
+
+    結果を一時ファイルへ逐次書き出すperform_streaming_ocrで処理し、完了後に読み込んで返します。
+    全ページの結果を保持する必要がない場合は、perform_streaming_ocrを直接使用してください。
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ocr_output_path = Path(tmp_dir) / f"{input_path.stem}_ocr_results.json"
+        perform_streaming_ocr(
+            input_path,
+            device,
+            dpi,
+            logger,
+            ocr_output_path,
+            overlap_threshold,
+            pdf_document=pdf_document,
+            render_workers=render_workers,
+            colorspace=colorspace,
+            half_precision=half_precision,
+            skip_blank_pages=skip_blank_pages,
+        )
+        return load_ocr_results(ocr_output_path)
+
+
+def perform_streaming_ocr(
+    input_path: Path,
+    device: str,
+    dpi: int,
+    logger,
+    ocr_output_path: Path,
+    overlap_threshold: float = 0.6,
+    *,
+    pdf_document=None,
+    source_fingerprint: Optional[Dict[str, int]] = None,
+    render_workers: Optional[int] = None,
+    searchable_pdf=None,
+    colorspace: str = "rgb",
+    half_precision: bool = False,
+    skip_blank_pages: bool = False,
+) -> Dict[str, int]:
+    """
+    メモリ効率的なOCR処理を実行し、結果をocr_output_pathへ逐次書き出す
+
+    各ページの結果は読み順ソートと重複削除を行った後、ocr_output_pathへ逐次書き出し、メモリには保持しません。
+    pdf_documentを渡した場合は開いたままのPDFを使用し、閉じません。
+    searchable_pdf（SearchablePDFWriter）を渡した場合は、OCRに使用したページ画像から検索可能なPDFのページを順に追加します。
+    PDF作成のためにページを画像化し直さずに済みます（保存は呼び出し側で行います）。
+    render_workersはページの画像化に使用するプロセス数です（省略時はCPUコア数から決定）。
+    colorspaceはページを画像化する際の色空間（"rgb"、"gray" または ページごとに判定する "auto"）です。
+    half_precisionをTrueにすると、CUDA使用時に推論をfloat16の混合精度で実行します。
+    skip_blank_pagesをTrueにすると、白紙と判定したページはOCR処理を行わずテキストなしの結果とします。
+
+    Returns:
+        書き出した結果の統計情報（総ページ数、成功ページ数、総テキストブロック数、文書文字数）
+    """
+    # yomitoku/PyTorchの読み込みは時間がかかるため、OCRを実行する場合のみインポートする
+    from ocr_processor import OCRProcessor, parse_ocr_results_columnar
+
     memory_monitor = SimpleMemoryMonitor(logger)
     memory_monitor.log_memory_usage("OCR処理開始")
 
@@ -173,131 +368,190 @@ def perform_memory_efficient_ocr(
             logger.warning("利用可能メモリが少ない状態です。処理が遅くなる可能性があります。")
 
         # OCRProcessorを作成
-        ocr_processor = OCRProcessor(device=device, visualize=False)
-
-        # PDFファイルを開いてページ数を取得
-        import fitz
-
-        pdf_document = fitz.open(input_path)
-        total_pages = pdf_document.page_count
-        pdf_document.close()
-        del pdf_document
-
-        logger.info(f"総ページ数: {total_pages}")
+        ocr_processor = OCRProcessor(
+            device=device, visualize=False, half_precision=half_precision, skip_blank_pages=skip_blank_pages
+        )
 
-        # 推奨バッチサイズを計算
-        batch_size = get_optimal_batch_size(total_pages)
-        logger.info(f"推奨バッチサイズ: {batch_size}ページ")
+        # PDFファイルを開く（全ページの処理が終わるまで開いたままにし、ページごとに開き直さない）
+        owns_document = pdf_document is None
+        if owns_document:
+            import fitz
 
-        # 結果を格納するリスト
-        pages_results = []
-        total_processing_time = 0
+            pdf_document = fitz.open(input_path)
+        try:
+            total_pages = pdf_document.page_count
 
-        # ページごとに処理
-        for page_num in range(total_pages):
-            logger.info(f"ページ {page_num + 1}/{total_pages} を処理中...")
+            logger.info(f"総ページ数: {total_pages}")
 
-            # 10ページごとにメモリ使用量をログ出力
-            if page_num % 10 == 0:
-                memory_monitor.log_memory_usage(f"ページ{page_num + 1}")
-                memory_monitor.force_garbage_collection()
+            # 推奨バッチサイズを計算
+            batch_size = get_optimal_batch_size(total_pages)
+            logger.info(f"推奨バッチサイズ: {batch_size}ページ")
 
-            pixmap = None
-            try:
-                # 1ページずつ画像に変換
-                pixmap = convert_single_page_to_image(input_path, page_num, dpi)
-
-                # OCR処理
-                start_time = time.time()
-                ocr_result = ocr_processor.perform_ocr(pixmap)
-                processing_time = time.time() - start_time
-                total_processing_time += processing_time
-
-                if ocr_result["success"]:
-                    # OCR結果を解析
-                    text_blocks = parse_ocr_results(ocr_result["results"])
-
-                    # TextBlockリストを作成
-                    page_text_blocks = []
-                    for block_data in text_blocks:
-                        bbox = BoundingBox(
-                            x0=block_data["bbox"][0],
-                            y0=block_data["bbox"][1],
-                            x1=block_data["bbox"][2],
-                            y1=block_data["bbox"][3],
-                        )
-                        text_block = TextBlock(
-                            text=block_data["text"],
-                            bbox=bbox,
-                            confidence=block_data["confidence"],
-                            direction=block_data.get("direction", "horizontal"),
-                            block_id=len(page_text_blocks) + 1,
-                        )
-                        page_text_blocks.append(text_block)
-
-                    page_result = PageOCRResult(
-                        page_number=page_num + 1,
-                        text_blocks=page_text_blocks,
-                        page_width=pixmap.width,
-                        page_height=pixmap.height,
-                        success=True,
-                        processing_time=processing_time,
-                    )
-
-                    logger.info(f"ページ {page_num + 1}: {len(text_blocks)}個のテキストブロックを検出")
-                else:
-                    # 失敗した場合
-                    page_result = PageOCRResult(
-                        page_number=page_num + 1,
-                        text_blocks=[],
-                        page_width=pixmap.width if pixmap else 0,
-                        page_height=pixmap.height if pixmap else 0,
-                        success=False,
-                        error=ocr_result["error"],
-                        processing_time=processing_time,
-                    )
-                    logger.warning(f"ページ {page_num + 1} のOCR処理が失敗しました: {ocr_result['error']}")
+            total_processing_time = 0
+            removed_counts = {}
+            pdf_error = None
 
-                pages_results.append(page_result)
+            # ページの画像化（CPU）とOCR（GPU）を並行させるため、画像化はワーカープロセスで先行して行う
+            if render_workers is None:
+                render_workers = _default_render_workers(total_pages)
+            if render_workers > 1:
+                logger.info(f"{render_workers}プロセスでページを画像化します")
+            rendered_pages = _iter_rendered_pages(
+                input_path, pdf_document, total_pages, dpi, render_workers, colorspace
+            )
 
-            except Exception as e:
-                logger.error(f"ページ {page_num + 1} の処理中にエラーが発生しました: {e}")
-                # エラーページの結果を作成
-                error_page = PageOCRResult(
-                    page_number=page_num + 1,
-                    text_blocks=[],
-                    page_width=0,
-                    page_height=0,
-                    success=False,
-                    error=str(e),
-                    processing_time=0,
-                )
-                pages_results.append(error_page)
-            finally:
-                # メモリを明示的に解放
-                if pixmap:
-                    del pixmap
-                gc.collect()
+            writer = OCRResultsWriter(
+                ocr_output_path, input_path, device_used=device, dpi=dpi, source_fingerprint=source_fingerprint
+            )
+            with writer:
+                try:
+                    # バッチ単位で処理
+                    for batch_start in range(0, total_pages, batch_size):
+                        batch_page_nums = list(range(batch_start, min(batch_start + batch_size, total_pages)))
+                        logger.info(f"ページ {batch_start + 1}-{batch_page_nums[-1] + 1}/{total_pages} を処理中...")
+
+                        # 10ページごとにメモリ使用量をログ出力
+                        if any(page_num % 10 == 0 for page_num in batch_page_nums):
+                            memory_monitor.log_memory_usage(f"ページ{batch_start + 1}")
+
+                        # 完全なガベージコレクションは生存オブジェクト数に比例して時間がかかるため、一定ページごとにのみ実行する
+                        # （Pixmapなどは参照カウントにより解放されるため、毎ページ実行する必要はない）
+                        if batch_start > 0 and any(page_num % GC_INTERVAL_PAGES == 0 for page_num in batch_page_nums):
+                            memory_monitor.force_garbage_collection()
+
+                        # 画像化済みのページをバッチサイズ分受け取る（変換に失敗したページはエラー結果とする）
+                        batch_pixmaps = []
+                        batch_results = []
+                        for _ in batch_page_nums:
+                            page_num, pixmap, error = next(rendered_pages)
+                            if error is None:
+                                batch_pixmaps.append((page_num, pixmap))
+                            else:
+                                logger.error(f"ページ {page_num + 1} の処理中にエラーが発生しました: {error}")
+                                batch_results.append(
+                                    PageOCRResult(
+                                        page_number=page_num + 1,
+                                        page_width=0,
+                                        page_height=0,
+                                        success=False,
+                                        error=str(error),
+                                        processing_time=0,
+                                    )
+                                )
+
+                        try:
+                            # バッチ内のページをまとめてOCR処理
+                            start_time = time.time()
+                            ocr_results = ocr_processor.perform_ocr_batch([pixmap for _, pixmap in batch_pixmaps])
+                            batch_time = time.time() - start_time
+                            total_processing_time += batch_time
+
+                            # ページごとの処理時間はバッチの処理時間を均等に割り当てる
+                            processing_time = batch_time / len(batch_pixmaps) if batch_pixmaps else 0.0
+
+                            for (page_num, pixmap), ocr_result in zip(batch_pixmaps, ocr_results):
+                                if ocr_result.get("blank"):
+                                    logger.info(f"ページ {page_num + 1}: 白紙と判定したためOCR処理をスキップしました")
+
+                                if ocr_result["success"]:
+                                    # OCR結果を列ごとの配列として解析し、ブロックごとのオブジェクトを作らずに結果を作成
+                                    page_result = PageOCRResult.from_columns(
+                                        page_number=page_num + 1,
+                                        **parse_ocr_results_columnar(ocr_result["results"]),
+                                        page_width=pixmap.width,
+                                        page_height=pixmap.height,
+                                        success=True,
+                                        processing_time=processing_time,
+                                    )
+
+                                    logger.info(
+                                        f"ページ {page_num + 1}: {page_result.text_count}個のテキストブロックを検出"
+                                    )
+                                else:
+                                    # 失敗した場合
+                                    page_result = PageOCRResult(
+                                        page_number=page_num + 1,
+                                        page_width=pixmap.width,
+                                        page_height=pixmap.height,
+                                        success=False,
+                                        error=ocr_result["error"],
+                                        processing_time=processing_time,
+                                    )
+                                    logger.warning(
+                                        f"ページ {page_num + 1} のOCR処理が失敗しました: {ocr_result['error']}"
+                                    )
+
+                                batch_results.append(page_result)
+
+                        except Exception as e:
+                            logger.error(
+                                f"ページ {batch_start + 1}-{batch_page_nums[-1] + 1} の処理中にエラーが発生しました: {e}"
+                            )
+                            # 結果が作成されていないページをエラーページとして記録
+                            done = {page.page_number for page in batch_results}
+                            for page_num, _ in batch_pixmaps:
+                                if page_num + 1 not in done:
+                                    batch_results.append(
+                                        PageOCRResult(
+                                            page_number=page_num + 1,
+                                            page_width=0,
+                                            page_height=0,
+                                            success=False,
+                                            error=str(e),
+                                            processing_time=0,
+                                        )
+                                    )
+                        finally:
+                            # CUDAアロケータに溜まった未使用領域が大きくなった場合のみGPUへ返却する
+                            ocr_processor.release_unused_gpu_memory()
+
+                        # ページ番号順に読み順ソートと重複削除を行い、結果を書き出す（書き出したページは保持しない）
+                        pixmaps = {page_num + 1: pixmap for page_num, pixmap in batch_pixmaps}
+                        for page_result in sorted(batch_results, key=lambda page: page.page_number):
+                            page_result = sort_text_blocks_by_reading_order(page_result)
+                            if page_result.success and page_result.text_count:
+                                removed_count = page_result.remove_duplicate_blocks(overlap_threshold)
+                                if removed_count > 0:
+                                    removed_counts[page_result.page_number] = removed_count
+                            writer.write_page(page_result)
+
+                            if searchable_pdf is not None:
+                                try:
+                                    pixmap = pixmaps.get(page_result.page_number)
+                                    if pixmap is None:
+                                        # 画像化に失敗したページは画像化し直さず、入力PDFのページをそのまま複製する
+                                        logger.warning(
+                                            f"ページ {page_result.page_number}: 画像化に失敗したため、"
+                                            "元のページをOCRテキストなしで複製します"
+                                        )
+                                        searchable_pdf.add_source_page(pdf_document, page_result.page_number - 1)
+                                    else:
+                                        searchable_pdf.add_page(pixmap, page_result)
+                                except Exception as e:
+                                    # PDFの作成は中止するが、OCR処理と結果の保存は最後まで行う
+                                    logger.error(
+                                        f"ページ {page_result.page_number} の検索可能なPDFページ作成に失敗しました: {e}"
+                                    )
+                                    pdf_error = e
+                                    searchable_pdf = None
+
+                        # メモリを明示的に解放
+                        del batch_results, batch_pixmaps, pixmaps
+                finally:
+                    # 画像化を打ち切り、ワーカープロセスを終了する
+                    rendered_pages.close()
+
+                writer.close(total_processing_time)
+        finally:
+            # 途中で例外が発生した場合も、自身で開いたPDFは閉じる
+            if owns_document:
+                pdf_document.close()
 
         # OCRProcessorのメモリを解放
         ocr_processor.clear_memory()
         del ocr_processor
         gc.collect()
 
-        # DocumentOCRResultを作成
-        document_result = DocumentOCRResult(
-            input_file=input_path,
-            pages=pages_results,
-            total_processing_time=total_processing_time,
-            device_used=device,
-            dpi=dpi,
-        )
-
-        # 文書全体のテキストブロックを読み順にソート
-        sort_document_text_blocks(document_result)
-
-        # 重複テキストブロックを削除
-        removed_counts = document_result.remove_duplicate_blocks(overlap_threshold)
         if removed_counts:
             total_removed = sum(removed_counts.values())
             logger.info(f"重複テキストブロックを削除しました: 総計{total_removed}個")
@@ -306,13 +560,17 @@ def perform_memory_efficient_ocr(
         else:
             logger.info("重複テキストブロックは検出されませんでした")
 
-        logger.info(f"OCR処理完了 - 成功: {document_result.successful_pages}/{document_result.total_pages}ページ")
+        summary = writer.summary
+        logger.info(f"OCR処理完了 - 成功: {summary['successful_pages']}/{summary['total_pages']}ページ")
         logger.info(f"総処理時間: {total_processing_time:.2f}秒")
 
         memory_monitor.log_memory_usage("OCR処理完了")
         memory_monitor.log_memory_summary()
 
-        return document_result
+        if pdf_error is not None:
+            raise RuntimeError(f"検索可能なPDFの作成に失敗しました: {pdf_error}") from pdf_error
+
+        return summary
 
     except Exception as e:
         logger.error(f"メモリ効率的OCR処理中にエラーが発生しました: {e}")
@@ -320,13 +578,86 @@ def perform_memory_efficient_ocr(
         raise
 
 
+def load_cached_ocr_results(
+    ocr_output_path: Path,
+    source_fingerprint: Dict[str, int],
+    overlap_threshold: float,
+    logger,
+    memory_monitor: SimpleMemoryMonitor,
+) -> bool:
+    """
+    保存済みのOCR結果が現在の入力PDF・DPI設定に対応していれば、読み順ソートと重複削除を行って保存し直す
+
+    ページは1ページずつ読み込んで書き出すため、全ページの結果を同時にメモリへ保持しません。
+    再利用できる場合はTrueを返します（結果はiter_ocr_result_pagesで読み込んでください）。
+    """
+    if not ocr_output_path.exists():
+        return False
+
+    logger.info(f"既存のOCR結果を読み込んでいます: {ocr_output_path}")
+    try:
+        metadata = read_ocr_results_metadata(ocr_output_path)
+
+        # 識別情報を持たない旧形式の結果はそのまま再利用する
+        if metadata.get("source_fingerprint") not in (None, source_fingerprint):
+            logger.info("入力PDFまたはDPI設定が前回から変更されているため、OCR処理を再実行します")
+            return False
+
+        # 既存OCR結果のテキストブロックを読み順にソートし、重複テキストブロックを削除して保存し直す
+        removed_counts = {}
+        writer = OCRResultsWriter(
+            ocr_output_path,
+            Path(metadata["input_file"]),
+            device_used=metadata.get("device_used", "cpu"),
+            dpi=metadata.get("dpi", 300),
+            source_fingerprint=metadata.get("source_fingerprint"),
+        )
+        with writer:
+            for page_result in iter_sorted_pages(iter_ocr_result_pages(ocr_output_path)):
+                if page_result.success and page_result.text_count:
+                    removed_count = page_result.remove_duplicate_blocks(overlap_threshold)
+                    if removed_count > 0:
+                        removed_counts[page_result.page_number] = removed_count
+                writer.write_page(page_result)
+            writer.close(metadata.get("total_processing_time", 0.0))
+
+        logger.info(f"OCR結果を読み込みました: {writer.total_pages}ページ")
+        logger.info("既存OCR結果のテキストブロックを読み順にソート完了")
+        if removed_counts:
+            total_removed = sum(removed_counts.values())
+            logger.info(f"既存OCR結果から重複テキストブロックを削除しました: 総計{total_removed}個")
+            for page_num, count in removed_counts.items():
+                logger.info(f"  - ページ{page_num}: {count}個削除")
+        else:
+            logger.info("既存OCR結果に重複テキストブロックは検出されませんでした")
+
+        memory_monitor.log_memory_usage("OCR結果読み込み完了")
+        return True
+
+    except Exception as e:
+        logger.warning(f"OCR結果の読み込みに失敗しました: {e}")
+        return False
+
+
 def main() -> None:
     """メイン処理"""
     memory_monitor = None
+    pdf_document = None
+    searchable_pdf = None
     try:
         # 引数の解析
         args = parse_arguments()
 
+        # PyMuPDFの読み込みを引数解析（--help等）の後に行い、起動を軽くする
+        import fitz
+
+        from pdf_processor import (
+            SearchablePDFWriter,
+            create_memory_efficient_searchable_pdf,
+            get_document_info,
+            render_page_to_image,
+        )
+
         # ロギング設定
         setup_logging(args.verbose)
         logger = logging.getLogger(__name__)
@@ -344,6 +675,9 @@ def main() -> None:
         input_path = validate_input_file(args.input_pdf)
         logger.info(f"入力PDFファイルを確認しました: {input_path}")
 
+        # 入力PDFは一度だけ開き、情報取得・OCR・PDF作成の各処理で共有する
+        pdf_document = fitz.open(input_path)
+
         # 出力ディレクトリの作成
         output_dir = create_output_dir(args.output_dir)
         logger.info(f"出力ディレクトリを準備しました: {output_dir}")
@@ -352,90 +686,103 @@ def main() -> None:
         output_path = generate_output_filename(input_path, output_dir)
         logger.info(f"出力ファイル: {output_path}")
 
-        # Step 2: PDFファイルの情報を取得
-        logger.info("PDFファイルの情報を取得中...")
-        pdf_info = get_pdf_info(input_path)
-        logger.info(f"PDFページ数: {pdf_info['page_count']}")
-        logger.info(f"暗号化: {'はい' if pdf_info['is_encrypted'] else 'いいえ'}")
-
-        # 大容量PDFの警告
-        if pdf_info["page_count"] > 100:
-            logger.warning(f"大容量PDF ({pdf_info['page_count']}ページ) を処理します。メモリ使用量にご注意ください。")
-
-        memory_monitor.log_memory_usage("PDF情報取得完了")
+        # ページ画像の埋め込み形式（0の場合はJPEGにせず可逆圧縮で埋め込む）
+        jpeg_quality = args.jpeg_quality or None
 
-        # OCR結果の読み込み試行
+        # 保存済みOCR結果の読み込み試行（入力PDFとDPI設定が前回と同じ場合のみ再利用）
         ocr_output_path = output_dir / f"{input_path.stem}_ocr_results.json"
-        document_result = None
-
-        if ocr_output_path.exists():
-            logger.info(f"既存のOCR結果を読み込んでいます: {ocr_output_path}")
-            try:
-                document_result = load_ocr_results(ocr_output_path)
-                logger.info(f"OCR結果を読み込みました: {document_result.total_pages}ページ")
-
-                # 既存OCR結果のテキストブロックも読み順にソート
-                sort_document_text_blocks(document_result)
-                logger.info("既存OCR結果のテキストブロックを読み順にソート完了")
-
-                # 重複テキストブロックを削除
-                removed_counts = document_result.remove_duplicate_blocks(args.overlap_threshold)
-                if removed_counts:
-                    total_removed = sum(removed_counts.values())
-                    logger.info(f"既存OCR結果から重複テキストブロックを削除しました: 総計{total_removed}個")
-                    for page_num, count in removed_counts.items():
-                        logger.info(f"  - ページ{page_num}: {count}個削除")
-
-                    # 重複削除後の結果を再保存
-                    save_ocr_results(document_result, ocr_output_path)
-                    logger.info(f"重複削除後のOCR結果を保存しました: {ocr_output_path}")
-                else:
-                    logger.info("既存OCR結果に重複テキストブロックは検出されませんでした")
+        source_fingerprint = create_source_fingerprint(input_path, args.dpi)
+        use_cached_results = load_cached_ocr_results(
+            ocr_output_path, source_fingerprint, args.overlap_threshold, logger, memory_monitor
+        )
+        # 保存済みOCR結果はPDF作成時に1ページずつ読み込む
+        ocr_pages = iter_ocr_result_pages(ocr_output_path) if use_cached_results else None
+
+        # Step 2: PDFファイルの情報を取得（保存済みOCR結果を再利用する場合は不要）
+        if not use_cached_results:
+            logger.info("PDFファイルの情報を取得中...")
+            pdf_info = get_document_info(pdf_document)
+            logger.info(f"PDFページ数: {pdf_info['page_count']}")
+            logger.info(f"暗号化: {'はい' if pdf_info['is_encrypted'] else 'いいえ'}")
+
+            # 大容量PDFの警告
+            if pdf_info["page_count"] > 100:
+                logger.warning(
+                    f"大容量PDF ({pdf_info['page_count']}ページ) を処理します。メモリ使用量にご注意ください。"
+                )
 
-                memory_monitor.log_memory_usage("OCR結果読み込み完了")
-            except Exception as e:
-                logger.warning(f"OCR結果の読み込みに失敗しました: {e}")
-                document_result = None
+            memory_monitor.log_memory_usage("PDF情報取得完了")
 
         # Step 3: OCR処理の実行
         if args.test_ocr:
             logger.info("OCRテストモード: 最初のページのみ処理します")
             # テスト用に1ページのみ処理
-            pixmap = convert_single_page_to_image(input_path, 0, args.dpi)
-            test_ocr_processing(pixmap, args.device, logger)
+            pixmap = render_page_to_image(pdf_document, 0, args.dpi, args.colorspace)
+            test_ocr_processing(pixmap, args.device, logger, half_precision=args.half_precision)
             # Pixmapの明示的解放
             del pixmap
             gc.collect()
-        elif document_result is None:
+        elif args.skip_ocr:
+            logger.info("OCRスキップモード: OCR処理を実行しません")
+        elif not use_cached_results:
             logger.info("全ページの構造化OCR処理を開始...")
 
-            # メモリ効率的な構造化OCR処理を実行
-            document_result = perform_memory_efficient_ocr(
-                input_path, args.device, args.dpi, logger, args.overlap_threshold
-            )
+            # 検索可能なPDFのページはOCRに使用したページ画像からOCR処理と同時に作成する
+            if not args.ocr_only:
+                searchable_pdf = SearchablePDFWriter(
+                    output_path, args.dpi, jpeg_quality=jpeg_quality, fast_save=args.fast_save
+                )
 
-            # OCR結果をJSONファイルに保存
-            save_ocr_results(document_result, ocr_output_path)
+            # メモリ効率的な構造化OCR処理を実行（結果はページごとにJSONファイルへ逐次保存される）
+            summary = perform_streaming_ocr(
+                input_path,
+                args.device,
+                args.dpi,
+                logger,
+                ocr_output_path,
+                args.overlap_threshold,
+                pdf_document=pdf_document,
+                source_fingerprint=source_fingerprint,
+                render_workers=args.render_workers,
+                searchable_pdf=searchable_pdf,
+                colorspace=args.colorspace,
+                half_precision=args.half_precision,
+                skip_blank_pages=args.skip_blank_pages,
+            )
             logger.info(f"OCR結果を保存しました: {ocr_output_path}")
 
             # 文書の統計情報を表示
             logger.info("文書統計:")
-            logger.info(f"  - 総ページ数: {document_result.total_pages}")
-            logger.info(f"  - 成功ページ数: {document_result.successful_pages}")
-            logger.info(f"  - 総テキストブロック数: {document_result.total_text_blocks}")
-            logger.info(f"  - 文書文字数: {len(document_result.document_text)}")
+            logger.info(f"  - 総ページ数: {summary['total_pages']}")
+            logger.info(f"  - 成功ページ数: {summary['successful_pages']}")
+            logger.info(f"  - 総テキストブロック数: {summary['total_text_blocks']}")
+            logger.info(f"  - 文書文字数: {summary['document_length']}")
 
             memory_monitor.log_memory_usage("OCR処理完了")
         else:
             logger.info("既存のOCR結果を使用します")
 
         # Step 5: 検索可能なPDF作成（メモリ効率化）
-        if not args.test_ocr and not args.ocr_only and document_result is not None:
+        if not args.test_ocr and not args.ocr_only and (ocr_pages is not None or searchable_pdf is not None):
             logger.info("Step 5: 検索可能なPDFファイルを作成中...")
 
             try:
-                # メモリ効率的な検索可能PDF作成
-                create_memory_efficient_searchable_pdf(input_path, document_result.pages, output_path, args.dpi)
+                if searchable_pdf is not None:
+                    # OCR処理と同時に作成したページを保存
+                    searchable_pdf.close()
+                    searchable_pdf = None
+                else:
+                    # メモリ効率的な検索可能PDF作成
+                    create_memory_efficient_searchable_pdf(
+                        input_path,
+                        ocr_pages,
+                        output_path,
+                        args.dpi,
+                        pdf_document=pdf_document,
+                        jpeg_quality=jpeg_quality,
+                        fast_save=args.fast_save,
+                        colorspace=args.colorspace,
+                    )
                 logger.info(f"検索可能なPDFファイルが作成されました: {output_path}")
 
                 # ファイルサイズを確認
@@ -449,7 +796,9 @@ def main() -> None:
                 raise
         elif args.ocr_only:
             logger.info("OCRのみモード: 検索可能なPDF作成をスキップしました")
-        elif document_result is None:
+        elif args.skip_ocr:
+            logger.info("OCR結果がないため、PDFファイルの情報取得のみで終了しました")
+        elif ocr_pages is None:
             logger.warning("OCR結果がないため、検索可能なPDF作成をスキップしました")
 
         logger.info("処理が完了しました")
@@ -461,6 +810,11 @@ def main() -> None:
             memory_monitor.log_memory_usage("エラー発生時")
         sys.exit(1)
     finally:
+        if searchable_pdf is not None:
+            searchable_pdf.discard()
+        if pdf_document is not None:
+            pdf_document.close()
+
         # 最終的なメモリ使用量をログ出力
         if memory_monitor:
             memory_monitor.log_memory_summary()
@@ -5,14 +5,22 @@ yomitokuのDocumentAnalyzerを使用してPDF画像に対しOCR処理を実行
 テキストとバウンディングボックス情報を抽出します。
 """
 
+import asyncio
+import contextlib
 import logging
+import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Sized, Tuple
 
+import cv2  # yomitokuの依存パッケージ
 import fitz  # PyMuPDF
 import numpy as np
 
+# CUDAメモリの断片化を抑えるため、PyTorchの読み込み前にアロケータ設定を行う（ユーザー指定があればそれを優先）
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
 try:
     from yomitoku import DocumentAnalyzer
 except ImportError as e:
@@ -20,82 +28,155 @@ except ImportError as e:
     logging.error("pip install yomitoku または poetry install --extras cpu/cuda を実行してください")
     raise
 
-from data_structures import DocumentOCRResult, PageOCRResult, convert_legacy_ocr_result
+from data_structures import DocumentOCRResult, PageOCRResult  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
+# CUDAアロケータの未使用領域がこの値（MB）を超えたら解放する
+CUDA_CACHE_RELEASE_THRESHOLD_MB = 1024
+
+# 白紙判定用の縮小画像の長辺（ピクセル）と、背景の明るさを推定する際にさらに縮小する倍率
+BLANK_CHECK_SIZE = 1024
+BLANK_BACKGROUND_CELL = 16
+# 背景との輝度差がこの値（ノイズが多い画像ではノイズ量のBLANK_NOISE_FACTOR倍）を超える画素をインクとみなし、
+# インクの画素がBLANK_MIN_INK_AREA個以上つながった領域があれば白紙ではないとする
+BLANK_MIN_INK_CONTRAST = 16
+BLANK_NOISE_FACTOR = 6.0
+BLANK_MIN_INK_AREA = 3
+
 
 class OCRProcessor:
     """
     yomitokuを使用してOCR処理を実行するクラス
     """
 
-    def __init__(self, device: str = "cuda", visualize: bool = False):
+    def __init__(
+        self,
+        device: str = "cuda",
+        visualize: bool = False,
+        half_precision: bool = False,
+        skip_blank_pages: bool = False,
+    ):
         """
         OCRProcessorの初期化
 
         Args:
             device (str): 計算デバイス ("cuda" または "cpu")
             visualize (bool): 可視化結果を生成するかどうか
+            half_precision (bool): CUDA使用時に推論をfloat16の自動混合精度で実行するかどうか
+            skip_blank_pages (bool): 白紙と判定したページのOCR処理を省略するかどうか
         """
         self.device = device
         self.visualize = visualize
+        self.half_precision = half_precision
+        self.skip_blank_pages = skip_blank_pages
         self.analyzer = None
+        self._image_buffer: Optional[np.ndarray] = None  # ページ画像用の再利用バッファ（1次元）
+        self._executor = ThreadPoolExecutor(max_workers=1)  # perform_ocr_async用（スレッドは初回使用時に起動）
 
-        logger.info(f"OCRProcessor初期化 - device: {device}, visualize: {visualize}")
+        logger.info(f"OCRProcessor初期化 - device: {device}, visualize: {visualize}, half_precision: {half_precision}")
 
     def _initialize_analyzer(self) -> None:
         """
         DocumentAnalyzerの遅延初期化
-        初回使用時にモデルをロードします
+        初回使用時にモデルをロードし、ダミー画像で1回推論してカーネルの準備を済ませます
         """
         if self.analyzer is None:
             logger.info("DocumentAnalyzerを初期化しています...")
             try:
+                import torch
+
+                # 入力サイズごとに最速の畳み込みアルゴリズムを選択させ、対応GPUではTF32演算を許可する
+                if self.device == "cuda":
+                    torch.backends.cudnn.benchmark = True
+                torch.set_float32_matmul_precision("high")
+
                 self.analyzer = DocumentAnalyzer(visualize=self.visualize, device=self.device)
                 logger.info("DocumentAnalyzerの初期化が完了しました")
             except Exception as e:
                 logger.error(f"DocumentAnalyzerの初期化に失敗しました: {e}")
                 raise
 
-    def pixmap_to_numpy(self, pixmap: fitz.Pixmap) -> np.ndarray:
+            # ウォームアップ（失敗しても実際のページ処理には影響しないため、ログのみ出力する）
+            try:
+                start_time = time.time()
+                with self._inference_context():
+                    self.analyzer(np.zeros((64, 64, 3), dtype=np.uint8))
+                logger.debug(f"DocumentAnalyzerのウォームアップ完了: {time.time() - start_time:.2f}秒")
+            except Exception as e:
+                logger.debug(f"DocumentAnalyzerのウォームアップに失敗しました: {e}")
+
+    def _inference_context(self) -> contextlib.ExitStack:
+        """
+        推論用のコンテキストを返す
+
+        推論のみのため勾配計算用の記録を無効化します。
+        half_precision=TrueかつCUDA使用時は、畳み込み・行列演算をfloat16で実行します
+        （正規化層やsoftmaxなど精度が必要な演算はautocastによりfloat32のまま実行されます）。
+        DocumentAnalyzerは後処理でテンソルをNumPy配列に変換するため、NumPyが扱えないbfloat16は使用しません。
+        OCR結果がfloat32と一致することは保証されないため、既定では無効です。
+        """
+        import torch
+
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self.device == "cuda" and self.half_precision:
+            stack.enter_context(torch.autocast(device_type="cuda", dtype=torch.float16))
+        return stack
+
+    def _get_image_buffer(self, height: int, width: int) -> np.ndarray:
+        """
+        ページ画像の変換先として再利用するバッファを (height, width, 3) の配列として返す
+
+        ページごとに数十MBの配列を確保し直さないよう、最大ページサイズ分の領域を保持して使い回します。
+        CUDA使用時はGPUへの転送が速いページロックメモリ（pinned memory）を確保します。
+        """
+        size = height * width * 3
+        if self._image_buffer is None or self._image_buffer.size < size:
+            self._image_buffer = None
+            if self.device == "cuda":
+                try:
+                    import torch
+
+                    self._image_buffer = torch.empty(size, dtype=torch.uint8, pin_memory=True).numpy()
+                except Exception as e:
+                    logger.debug(f"pinned memoryの確保に失敗したため通常のメモリを使用します: {e}")
+            if self._image_buffer is None:
+                self._image_buffer = np.empty(size, dtype=np.uint8)
+
+        return self._image_buffer[:size].reshape(height, width, 3)
+
+    def pixmap_to_numpy(self, pixmap: fitz.Pixmap, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         PyMuPDFのPixmapをnumpy配列に変換
 
         Args:
             pixmap (fitz.Pixmap): PyMuPDFのPixmapオブジェクト
+            out (Optional[np.ndarray]): 変換結果を書き込む (height, width, 3) のuint8配列（省略時は新規に確保）
 
         Returns:
             np.ndarray: BGRフォーマットの画像配列 (OpenCV形式)
         """
         try:
-            # Pixmapのバイトデータを取得
-            pix_data = pixmap.samples
-
             # 画像の形状を取得
             width = pixmap.width
             height = pixmap.height
             stride = pixmap.stride
+            n = pixmap.n
 
-            # numpy配列に変換
-            if pixmap.n == 4:  # RGBA
-                img_array = np.frombuffer(pix_data, dtype=np.uint8).reshape(height, stride // 4, 4)
-                # RGBAからBGRに変換 (アルファチャンネルを除去)
-                img_array = img_array[:, :width, [2, 1, 0]]  # RGBA -> BGR
-            elif pixmap.n == 3:  # RGB
-                img_array = np.frombuffer(pix_data, dtype=np.uint8).reshape(height, stride // 3, 3)
-                # RGBからBGRに変換
-                img_array = img_array[:, :width, [2, 1, 0]]  # RGB -> BGR
-            elif pixmap.n == 1:  # Grayscale
-                img_array = np.frombuffer(pix_data, dtype=np.uint8).reshape(height, stride)
-                img_array = img_array[:, :width]
-                # グレースケールをBGRに変換
-                img_array = np.stack([img_array, img_array, img_array], axis=2)
-            else:
-                raise ValueError(f"サポートされていないチャンネル数: {pixmap.n}")
+            color_conversions = {
+                4: cv2.COLOR_RGBA2BGR,  # RGBA -> BGR (アルファチャンネルを除去)
+                3: cv2.COLOR_RGB2BGR,  # RGB -> BGR
+                1: cv2.COLOR_GRAY2BGR,  # グレースケール -> BGR
+            }
+            if n not in color_conversions:
+                raise ValueError(f"サポートされていないチャンネル数: {n}")
+
+            # Pixmapのバッファをコピーせずにnumpy配列として参照し、行末のパディングを除いたビューを作成
+            view = np.frombuffer(pixmap.samples_mv, dtype=np.uint8).reshape(height, stride // n, n)[:, :width, :]
 
-            # 配列のcontiguousメモリレイアウトを確保
-            img_array = np.ascontiguousarray(img_array, dtype=np.uint8)
+            # チャンネル変換を1回で行う（出力は新しいcontiguousな配列）
+            img_array = cv2.cvtColor(view, color_conversions[n], dst=out)
 
             logger.debug(f"Pixmap変換完了 - shape: {img_array.shape}, dtype: {img_array.dtype}")
             return img_array
@@ -108,6 +189,9 @@ class OCRProcessor:
         """
         非同期OCR処理を実行
 
+        イベントループを止めないよう、OCR処理は専用のスレッドで実行します。
+        スレッドは1つのみのため、複数のタスクから呼び出してもGPUを同時に使用することはありません。
+
         Args:
             pixmap (fitz.Pixmap): PyMuPDFのPixmapオブジェクト
 
@@ -118,40 +202,15 @@ class OCRProcessor:
                 - 'ocr_vis': OCR可視化画像 (visualize=Trueの場合)
                 - 'layout_vis': レイアウト可視化画像 (visualize=Trueの場合)
                 - 'error': エラーメッセージ (失敗時)
+                - 'blank': 白紙と判定してOCR処理を省略した場合のみTrue (skip_blank_pages=Trueの場合)
         """
-        try:
-            # DocumentAnalyzerの初期化（遅延初期化）
-            self._initialize_analyzer()
-
-            # PixmapをOpenCV形式の画像に変換
-            img_array = self.pixmap_to_numpy(pixmap)
-
-            logger.debug(f"OCR処理開始 - 画像サイズ: {img_array.shape}")
-
-            # yomitokuでOCR実行
-            if self.visualize:
-                results, ocr_vis, layout_vis = self.analyzer(img_array)
-
-                return {
-                    "success": True,
-                    "results": results,
-                    "ocr_vis": ocr_vis,
-                    "layout_vis": layout_vis,
-                    "error": None,
-                }
-            else:
-                results, _, _ = self.analyzer(img_array)
-
-                return {"success": True, "results": results, "ocr_vis": None, "layout_vis": None, "error": None}
-
-        except Exception as e:
-            error_msg = f"OCR処理中にエラーが発生しました: {e}"
-            logger.error(error_msg)
-            return {"success": False, "results": None, "ocr_vis": None, "layout_vis": None, "error": error_msg}
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.perform_ocr, pixmap)
 
     def __del__(self):
         """デストラクタでリソースを明示的に解放"""
         try:
+            if hasattr(self, "_executor"):
+                self._executor.shutdown(wait=False)
             if hasattr(self, "analyzer") and self.analyzer is not None:
                 del self.analyzer
                 self.analyzer = None
@@ -167,13 +226,58 @@ class OCRProcessor:
             if hasattr(self, "analyzer") and self.analyzer is not None:
                 del self.analyzer
                 self.analyzer = None
+            self._image_buffer = None
             import gc
 
             gc.collect()
+            self._release_cuda_cache()
             logger.info("OCRProcessorのメモリを解放しました")
         except Exception as e:
             logger.warning(f"メモリ解放中にエラーが発生しました: {e}")
 
+    def _release_cuda_cache(self) -> None:
+        """PyTorchのCUDAアロケータが確保したまま未使用の領域をGPUへ返却する"""
+        if self.device != "cuda":
+            return
+
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+            torch.cuda.empty_cache()
+            torch.cuda.ipc_collect()
+
+    def release_unused_gpu_memory(self, threshold_mb: int = CUDA_CACHE_RELEASE_THRESHOLD_MB) -> bool:
+        """
+        CUDAアロケータの未使用領域がしきい値を超えた場合のみ解放する
+
+        empty_cacheはGPUとの同期と再確保のコストがかかるため、ページごとではなく必要な時のみ実行します。
+
+        Args:
+            threshold_mb (int): 解放を行う未使用領域のしきい値（MB）
+
+        Returns:
+            bool: 解放を行った場合True
+        """
+        if self.device != "cuda":
+            return False
+
+        import gc
+
+        import torch
+
+        if not torch.cuda.is_available():
+            return False
+
+        unused_mb = (torch.cuda.memory_reserved() - torch.cuda.memory_allocated()) / (1024 * 1024)
+        if unused_mb <= threshold_mb:
+            return False
+
+        gc.collect()
+        self._release_cuda_cache()
+        logger.debug(f"CUDAキャッシュを解放しました: 未使用領域 {unused_mb:.0f}MB")
+        return True
+
     def perform_ocr(self, pixmap: fitz.Pixmap) -> Dict[str, Any]:
         """
         OCR処理を実行（メモリ最適化版）
@@ -188,49 +292,72 @@ class OCRProcessor:
                 - 'ocr_vis': OCR可視化画像 (visualize=Trueの場合)
                 - 'layout_vis': レイアウト可視化画像 (visualize=Trueの場合)
                 - 'error': エラーメッセージ (失敗時)
+                - 'blank': 白紙と判定してOCR処理を省略した場合のみTrue (skip_blank_pages=Trueの場合)
         """
-        img_array = None
+        result = self._analyze_pixmap(pixmap)
+
+        # メモリを明示的に解放
+        import gc
+
+        gc.collect()
+
+        return result
+
+    def perform_ocr_batch(self, pixmaps: List[fitz.Pixmap]) -> List[Dict[str, Any]]:
+        """
+        複数ページのOCR処理をまとめて実行
+
+        DocumentAnalyzerは1画像ずつの入力にのみ対応しているため、バッチ内のページを順に解析します。
+        perform_ocrと異なりガベージコレクションは行わないため、呼び出し側で必要な間隔で実行してください。
+
+        Args:
+            pixmaps (List[fitz.Pixmap]): PyMuPDFのPixmapオブジェクトのリスト
+
+        Returns:
+            List[Dict[str, Any]]: 各ページのOCR結果（perform_ocrと同じ形式）
+        """
+        return [self._analyze_pixmap(pixmap) for pixmap in pixmaps]
+
+    def _analyze_pixmap(self, pixmap: fitz.Pixmap) -> Dict[str, Any]:
+        """1ページ分の画像をDocumentAnalyzerで解析し、perform_ocr形式の結果辞書を返す"""
         try:
             # DocumentAnalyzerの初期化（遅延初期化）
             self._initialize_analyzer()
 
             # PixmapをOpenCV形式の画像に変換
-            img_array = self.pixmap_to_numpy(pixmap)
+            # 可視化画像が入力画像を参照する可能性があるため、再利用バッファは可視化無効時のみ使用する
+            out = None if self.visualize else self._get_image_buffer(pixmap.height, pixmap.width)
+            img_array = self.pixmap_to_numpy(pixmap, out=out)
 
-            logger.debug(f"OCR処理開始 - 画像サイズ: {img_array.shape}")
-
-            # yomitokuでOCR実行
-            if self.visualize:
-                results, ocr_vis, layout_vis = self.analyzer(img_array)
-
-                result = {
+            # 白紙ページは文字が存在しないため、OCRを実行せず空の結果を返す（ページ番号は呼び出し側でログ出力する）
+            if self.skip_blank_pages and is_blank_image(img_array):
+                logger.debug(f"白紙と判定したためOCR処理をスキップします - 画像サイズ: {img_array.shape}")
+                return {
                     "success": True,
-                    "results": results,
-                    "ocr_vis": ocr_vis,
-                    "layout_vis": layout_vis,
+                    "results": None,
+                    "ocr_vis": None,
+                    "layout_vis": None,
                     "error": None,
+                    "blank": True,
                 }
-            else:
-                results, _, _ = self.analyzer(img_array)
-
-                result = {"success": True, "results": results, "ocr_vis": None, "layout_vis": None, "error": None}
 
-            # メモリを明示的に解放
-            del img_array
-            import gc
+            logger.debug(f"OCR処理開始 - 画像サイズ: {img_array.shape}")
 
-            gc.collect()
+            # yomitokuでOCR実行（可視化画像はDocumentAnalyzerをvisualize=Trueで作成した場合のみ生成される）
+            with self._inference_context():
+                results, ocr_vis, layout_vis = self.analyzer(img_array)
 
-            return result
+            return {
+                "success": True,
+                "results": results,
+                "ocr_vis": ocr_vis if self.visualize else None,
+                "layout_vis": layout_vis if self.visualize else None,
+                "error": None,
+            }
 
         except Exception as e:
             error_msg = f"OCR処理中にエラーが発生しました: {e}"
             logger.error(error_msg)
-
-            import gc
-
-            gc.collect()
-
             return {"success": False, "results": None, "ocr_vis": None, "layout_vis": None, "error": error_msg}
 
     def perform_ocr_structured(self, pixmap: fitz.Pixmap, page_number: int) -> PageOCRResult:
@@ -250,14 +377,14 @@ class OCRProcessor:
             # 従来のOCR処理を実行
             ocr_result = self.perform_ocr(pixmap)
 
-            if ocr_result["success"]:
-                # OCR結果を解析
-                text_blocks = parse_ocr_results(ocr_result["results"])
+            if ocr_result.get("blank"):
+                logger.info(f"ページ {page_number}: 白紙と判定したためOCR処理をスキップしました")
 
-                # 新しいデータ構造に変換
-                result = convert_legacy_ocr_result(
+            if ocr_result["success"]:
+                # OCR結果を列ごとの配列として解析し、そのまま構造化データにする
+                result = PageOCRResult.from_columns(
                     page_number=page_number,
-                    text_blocks=text_blocks,
+                    **parse_ocr_results_columnar(ocr_result["results"]),
                     page_width=float(pixmap.width),
                     page_height=float(pixmap.height),
                     success=True,
@@ -275,7 +402,6 @@ class OCRProcessor:
             else:
                 return PageOCRResult(
                     page_number=page_number,
-                    text_blocks=[],
                     page_width=float(pixmap.width),
                     page_height=float(pixmap.height),
                     success=False,
@@ -287,7 +413,6 @@ class OCRProcessor:
             logger.error(f"ページ {page_number} のOCR処理でエラー: {e}")
             return PageOCRResult(
                 page_number=page_number,
-                text_blocks=[],
                 page_width=float(pixmap.width) if pixmap else 0.0,
                 page_height=float(pixmap.height) if pixmap else 0.0,
                 success=False,
@@ -295,27 +420,54 @@ class OCRProcessor:
                 processing_time=time.time() - start_time,
             )
 
-    def process_document(self, pixmaps: List[fitz.Pixmap], input_file: Path, dpi: int = 300) -> DocumentOCRResult:
+    def process_document(
+        self,
+        pixmaps: Iterable[fitz.Pixmap],
+        input_file: Path,
+        dpi: int = 300,
+        num_workers: Optional[int] = None,
+        total_pages: Optional[int] = None,
+    ) -> DocumentOCRResult:
         """
         文書全体のOCR処理を実行
 
+        pixmapsはジェネレータでもよく、生成されたページから順に処理するため
+        全ページの画像を同時にメモリへ保持する必要はありません。
+        device="cpu" の場合はページ単位でプロセスプールに分散して並列処理します。
+        GPUは1枚を全ページで共有するため、device="cuda" の場合はメインプロセスで逐次処理します。
+
         Args:
-            pixmaps: PDFページのPixmapリスト
+            pixmaps: PDFページのPixmapのイテラブル
             input_file: 入力PDFファイルのパス
             dpi: DPI設定
+            num_workers: CPU処理時のワーカープロセス数（デフォルト: CPUコア数）
+            total_pages: 総ページ数（ログ表示用。省略時はpixmapsの長さを使用）
 
         Returns:
             DocumentOCRResult: 文書全体のOCR結果
         """
         start_time = time.time()
 
-        logger.info(f"文書OCR処理開始: {len(pixmaps)}ページ")
+        if total_pages is None and isinstance(pixmaps, Sized):
+            total_pages = len(pixmaps)
+        page_label = total_pages if total_pages is not None else "?"
+
+        logger.info(f"文書OCR処理開始: {page_label}ページ")
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if total_pages is not None:
+            num_workers = min(num_workers, total_pages)
 
-        pages = []
-        for i, pixmap in enumerate(pixmaps, 1):
-            logger.info(f"ページ {i}/{len(pixmaps)} を処理中...")
-            page_result = self.perform_ocr_structured(pixmap, i)
-            pages.append(page_result)
+        if self.device == "cpu" and num_workers > 1:
+            pages = self._process_pages_in_parallel(pixmaps, num_workers, page_label)
+        else:
+            pages = []
+            for i, pixmap in enumerate(pixmaps, 1):
+                logger.info(f"ページ {i}/{page_label} を処理中...")
+                page_result = self.perform_ocr_structured(pixmap, i)
+                pages.append(page_result)
+                del pixmap
 
         total_time = time.time() - start_time
 
@@ -331,71 +483,236 @@ class OCRProcessor:
 
         return result
 
+    def _process_pages_in_parallel(
+        self, pixmaps: Iterable[fitz.Pixmap], num_workers: int, page_label: Any
+    ) -> List[PageOCRResult]:
+        """ページごとのOCR処理をプロセスプールで並列実行し、ページ番号順の結果を返す"""
+        logger.info(f"{num_workers}プロセスで並列OCR処理を実行します")
 
-def parse_ocr_results(results) -> List[Dict[str, Any]]:
+        pages = {}
+        page_sizes = {}
+
+        def collect(future, page_number: int) -> None:
+            try:
+                pages[page_number] = future.result()
+            except Exception as e:
+                logger.error(f"ページ {page_number} のOCR処理でエラー: {e}")
+                page_width, page_height = page_sizes[page_number]
+                pages[page_number] = PageOCRResult(
+                    page_number=page_number,
+                    page_width=page_width,
+                    page_height=page_height,
+                    success=False,
+                    error=str(e),
+                )
+            logger.info(f"ページ {page_number}/{page_label} の処理が完了しました")
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_ocr_worker,
+            initargs=(self.device, self.visualize, num_workers, self.skip_blank_pages),
+        ) as executor:
+            # ページが画像化され次第ワーカーへ投入する
+            # fitz.Pixmapはpickleできないため、PNGへのエンコード・デコードを省いて生の画素データとサイズ情報で渡す
+            # 処理待ちのページ数を制限し、画像化がOCRを大きく追い越してメモリを圧迫しないようにする
+            futures = {}
+            for i, pixmap in enumerate(pixmaps, 1):
+                if len(futures) >= num_workers * 2:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future, futures.pop(future))
+
+                page_sizes[i] = (float(pixmap.width), float(pixmap.height))
+                image = (pixmap.width, pixmap.height, pixmap.n, bool(pixmap.alpha), pixmap.samples)
+                futures[executor.submit(_ocr_one_page, image, i)] = i
+                del pixmap
+
+            for future in as_completed(futures):
+                collect(future, futures[future])
+
+        return [pages[i] for i in sorted(pages)]
+
+
+# ワーカープロセスごとに保持するOCRProcessor（モデルのロードはプロセスごとに1回のみ）
+_worker_processor: Optional[OCRProcessor] = None
+
+
+def _init_ocr_worker(device: str, visualize: bool, num_workers: int, skip_blank_pages: bool = False) -> None:
+    """ワーカープロセスの初期化処理"""
+    global _worker_processor
+
+    import torch
+
+    # ワーカー間でCPUコアを取り合わないよう、プロセスごとのスレッド数を制限する
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // num_workers))
+    _worker_processor = OCRProcessor(device=device, visualize=visualize, skip_blank_pages=skip_blank_pages)
+
+
+def _ocr_one_page(image: Tuple[int, int, int, bool, bytes], page_number: int) -> PageOCRResult:
+    """ワーカープロセスで1ページ分のOCR処理を実行（imageは (幅, 高さ, チャンネル数, アルファ有無, 画素データ)）"""
+    width, height, n, alpha, samples = image
+    colorspace = fitz.csGRAY if n - alpha == 1 else fitz.csRGB
+    pixmap = fitz.Pixmap(colorspace, width, height, samples, alpha)
+    return _worker_processor.perform_ocr_structured(pixmap, page_number)
+
+
+def is_blank_image(
+    img_array: np.ndarray, min_ink_contrast: int = BLANK_MIN_INK_CONTRAST, min_ink_area: int = BLANK_MIN_INK_AREA
+) -> bool:
     """
-    yomitokuのOCR結果を解析して、テキストとバウンディングボックス情報を抽出
+    画像が白紙（文字などのインクがない）かどうかを判定する
+
+    縮小したグレースケール画像から局所的な背景の明るさを推定し、背景との輝度差がしきい値を超える画素をインクとみなします。
+    しきい値は紙の色・照明のむらによらず背景との差で判定し、スキャン時のノイズが多い画像ではノイズ量に応じて引き上げます。
+    インクの画素がmin_ink_area個以上つながった領域が1つもない場合に白紙とします（孤立した小さなゴミは無視されます）。
+    淡い色の文字や小さなページ番号を白紙と誤判定しないよう、判定はOCRを実行する側に寄せています。
+
+    Args:
+        img_array (np.ndarray): BGRフォーマットの画像配列
+        min_ink_contrast (int): インクとみなす背景との輝度差の下限
+        min_ink_area (int): 白紙ではないとみなすインク領域の最小画素数（縮小画像上）
+
+    Returns:
+        bool: 白紙の場合True
+    """
+    gray = cv2.cvtColor(img_array, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+    scale = BLANK_CHECK_SIZE / max(height, width, 1)
+    if scale < 1.0:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        height, width = gray.shape
+
+    # 文字を均すほど縮小した画像のメディアンを元の大きさに戻し、背景の明るさとする
+    coarse_size = (max(1, width // BLANK_BACKGROUND_CELL), max(1, height // BLANK_BACKGROUND_CELL))
+    coarse = cv2.resize(gray, coarse_size, interpolation=cv2.INTER_AREA)
+    background = cv2.resize(cv2.medianBlur(coarse, 5), (width, height), interpolation=cv2.INTER_LINEAR)
+    deviation = cv2.absdiff(gray, background)
+
+    # 背景との差の中央値からノイズ量（標準偏差相当）を推定する
+    noise = 1.4826 * float(np.median(deviation))
+    ink = deviation > max(min_ink_contrast, BLANK_NOISE_FACTOR * noise)
+    if not ink.any():
+        return True
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(ink.view(np.uint8), connectivity=8)
+    return not (stats[1:, cv2.CC_STAT_AREA] >= min_ink_area).any()
+
+
+def parse_ocr_results_columnar(results) -> Dict[str, Any]:
+    """
+    yomitokuのOCR結果を解析して、テキストブロックの情報を列ごとの配列として抽出
+
+    ブロックごとの辞書を作らず、座標はまとめて配列化してから最小外接矩形を一括で計算します。
 
     Args:
         results: yomitokuのDocumentAnalyzerの結果オブジェクト
 
     Returns:
-        List[Dict[str, Any]]: テキストブロックのリスト
-            各要素は以下の形式:
+        Dict[str, Any]: 以下のキーを持つ辞書（PageOCRResult.from_columnsにそのまま渡せる形式）
             {
-                'text': str,  # テキスト内容
-                'bbox': [x0, y0, x1, y1],  # バウンディングボックス座標
-                'confidence': float,  # 信頼度
-                'direction': str  # テキストの方向 ('horizontal' or 'vertical')
+                'texts': List[str],  # テキスト内容
+                'bboxes': np.ndarray,  # (N, 4) float32 [x0, y0, x1, y1]
+                'confidences': np.ndarray,  # (N,) float32 信頼度
+                'directions': List[str]  # テキストの方向 ('horizontal' or 'vertical')
             }
     """
-    text_blocks = []
+    word_texts, word_points, word_confidences, word_directions = [], [], [], []
+    paragraph_texts, paragraph_boxes, paragraph_directions = [], [], []
 
     try:
         # DocumentAnalyzerSchemaからwords情報を取得
-        if hasattr(results, "words") and results.words:
-            for word in results.words:
-                # word.pointsは4点の座標 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                # これをbbox [x0, y0, x1, y1] 形式に変換
-                points = word.points
-                if len(points) == 4:
-                    # 4点から最小外接矩形を計算
-                    xs = [point[0] for point in points]
-                    ys = [point[1] for point in points]
-                    x0, y0 = min(xs), min(ys)
-                    x1, y1 = max(xs), max(ys)
-
-                    text_block = {
-                        "text": word.content,
-                        "bbox": [x0, y0, x1, y1],
-                        "confidence": getattr(word, "rec_score", 1.0),  # 認識スコア
-                        "direction": getattr(word, "direction", "horizontal"),  # テキスト方向
-                    }
-                    text_blocks.append(text_block)
+        # 要素はすべて同じスキーマのため、任意属性の有無はループの外で先頭要素から1回だけ判定する
+        words = getattr(results, "words", None)
+        if words:
+            # word.pointsは4点の座標 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+            words = [word for word in words if len(word.points) == 4]
+        if words:
+            word_points = [word.points for word in words]
+            word_texts = [word.content for word in words]
+            # 認識スコア
+            if hasattr(words[0], "rec_score"):
+                word_confidences = [word.rec_score for word in words]
+            else:
+                word_confidences = [1.0] * len(words)
+            # テキスト方向
+            if hasattr(words[0], "direction"):
+                word_directions = [word.direction for word in words]
+            else:
+                word_directions = ["horizontal"] * len(words)
 
         # 段落情報も追加（paragraphs）
-        if hasattr(results, "paragraphs") and results.paragraphs:
-            for paragraph in results.paragraphs:
-                if hasattr(paragraph, "contents") and paragraph.contents:
-                    # paragraphのboxは [x0, y0, x1, y1] 形式
-                    bbox = paragraph.box if hasattr(paragraph, "box") else [0, 0, 0, 0]
-
-                    text_block = {
-                        "text": paragraph.contents,
-                        "bbox": bbox,
-                        "confidence": 1.0,  # 段落レベルでは固定値
-                        "direction": getattr(paragraph, "direction", "horizontal"),
-                    }
-                    text_blocks.append(text_block)
-
-        logger.info(f"OCR結果解析完了 - {len(text_blocks)}個のテキストブロックを検出")
+        paragraphs = getattr(results, "paragraphs", None)
+        if paragraphs and hasattr(paragraphs[0], "contents"):
+            paragraphs = [paragraph for paragraph in paragraphs if paragraph.contents]
+        else:
+            paragraphs = []
+        if paragraphs:
+            paragraph_texts = [paragraph.contents for paragraph in paragraphs]
+            # paragraphのboxは [x0, y0, x1, y1] 形式
+            if hasattr(paragraphs[0], "box"):
+                paragraph_boxes = [paragraph.box for paragraph in paragraphs]
+            else:
+                paragraph_boxes = [[0, 0, 0, 0]] * len(paragraphs)
+            if hasattr(paragraphs[0], "direction"):
+                paragraph_directions = [paragraph.direction for paragraph in paragraphs]
+            else:
+                paragraph_directions = ["horizontal"] * len(paragraphs)
+
+        # 4点の座標から最小外接矩形 [x0, y0, x1, y1] を全単語まとめて計算
+        points = np.asarray(word_points, dtype=np.float32).reshape(-1, 4, 2)
+        word_bboxes = np.concatenate((points.min(axis=1), points.max(axis=1)), axis=1)
+        paragraph_bboxes = np.asarray(paragraph_boxes, dtype=np.float32).reshape(-1, 4)
+        word_confidences = np.asarray(word_confidences, dtype=np.float32)
+        paragraph_confidences = np.ones(len(paragraph_texts), dtype=np.float32)  # 段落レベルでは固定値
+
+        columns = {
+            "texts": word_texts + paragraph_texts,
+            "bboxes": np.concatenate((word_bboxes, paragraph_bboxes)),
+            "confidences": np.concatenate((word_confidences, paragraph_confidences)),
+            "directions": word_directions + paragraph_directions,
+        }
+
+        logger.info(f"OCR結果解析完了 - {len(columns['texts'])}個のテキストブロックを検出")
+        return columns
 
     except Exception as e:
         logger.error(f"OCR結果の解析中にエラーが発生しました: {e}")
         logger.debug(f"results型: {type(results)}")
         logger.debug(f"results属性: {dir(results) if hasattr(results, '__dict__') else 'N/A'}")
 
-    return text_blocks
+    return {
+        "texts": [],
+        "bboxes": np.empty((0, 4), dtype=np.float32),
+        "confidences": np.empty(0, dtype=np.float32),
+        "directions": [],
+    }
+
+
+def parse_ocr_results(results) -> List[Dict[str, Any]]:
+    """
+    yomitokuのOCR結果を解析して、テキストとバウンディングボックス情報を抽出
+
+    Args:
+        results: yomitokuのDocumentAnalyzerの結果オブジェクト
+
+    Returns:
+        List[Dict[str, Any]]: テキストブロックのリスト
+            各要素は以下の形式:
+            {
+                'text': str,  # テキスト内容
+                'bbox': [x0, y0, x1, y1],  # バウンディングボックス座標
+                'confidence': float,  # 信頼度
+                'direction': str  # テキストの方向 ('horizontal' or 'vertical')
+            }
+    """
+    columns = parse_ocr_results_columnar(results)
+    return [
+        {"text": text, "bbox": bbox, "confidence": confidence, "direction": direction}
+        for text, bbox, confidence, direction in zip(
+            columns["texts"], columns["bboxes"].tolist(), columns["confidences"].tolist(), columns["directions"]
+        )
+    ]
 
 
 def create_test_processor(device: str = "cpu", visualize: bool = False) -> OCRProcessor:
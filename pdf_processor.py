@@ -1,9 +1,17 @@
 import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
 
 import fitz
+import numpy as np
 
+from constants import RENDER_WORKERS_DEFAULT_MAX
 from data_structures import PageOCRResult
 
 
@@ -11,12 +19,16 @@ def get_japanese_font_name() -> str:
     return "japan"
 
 
+# ひらがな・カタカナ（U+3040-U+30FF）、CJK統合漢字（U+4E00-U+9FAF）、半角カタカナ（U+FF65-U+FF9F）
+_JAPANESE_CHARACTER_PATTERN = re.compile("[\u3040-\u30ff\u4e00-\u9faf\uff65-\uff9f]")
+
+
 def has_japanese_characters(text: str) -> bool:
-    for char in text:
-        code = ord(char)
-        if 0x3040 <= code <= 0x309F or 0x30A0 <= code <= 0x30FF or 0x4E00 <= code <= 0x9FAF or 0xFF65 <= code <= 0xFF9F:
-            return True
-    return False
+    # 1文字ずつPythonで比較せず、正規表現エンジン（C実装）で最初に見つかった時点で判定する
+    # ASCIIのみの文字列かどうかは文字列が保持する情報から即座に分かるため、英数字のみのテキストは走査しない
+    if text.isascii():
+        return False
+    return _JAPANESE_CHARACTER_PATTERN.search(text) is not None
 
 
 def select_appropriate_font(text: str) -> str:
@@ -26,162 +38,384 @@ def select_appropriate_font(text: str) -> str:
         return "helv"
 
 
+def page_font_selector(texts: Iterable[str]) -> Callable[[str], str]:
+    # ページ全体に日本語が含まれない場合は、テキストブロックごとに判定せず全ブロックで欧文フォントを使用する
+    if has_japanese_characters("".join(texts)):
+        return select_appropriate_font
+    return lambda text: "helv"
+
+
+# 縦書きテキストのフォントサイズに掛ける倍率
+VERTICAL_FONT_SCALE = 0.9
+
+
 def adjust_font_size_for_direction(font_size: float, direction: str) -> float:
-    return font_size * 0.9 if direction == "vertical" else font_size
+    return font_size * VERTICAL_FONT_SCALE if direction == "vertical" else font_size
+
+
+# MuPDFのキャッシュ（ストア）を空にする間隔（ページ数）
+MUPDF_STORE_SHRINK_INTERVAL = 8
+_pages_since_store_shrink = 0
+
+PDFSource = Union[Path, fitz.Document]
+
+# ページを画像化する際の色空間（"gray"の場合は1チャンネルで画像化し、以降の各処理で扱うデータ量を1/3にする）
+# "auto"の場合はページごとにdetect_page_colorspaceで判定し、白黒・グレースケールのページのみ"gray"で画像化する
+PAGE_COLORSPACES = {"rgb": fitz.csRGB, "gray": fitz.csGRAY}
+AUTO_COLORSPACE = "auto"
+
+# グレースケール判定に使用する画像化DPIと、色付きとみなす画素の条件（チャンネル間の差とその画素の割合）
+GRAYSCALE_CHECK_DPI = 36
+GRAYSCALE_MAX_CHANNEL_DIFF = 24
+GRAYSCALE_MAX_COLOR_RATIO = 0.001
+
 
+@contextmanager
+def _open_pdf(pdf: PDFSource) -> Iterator[fitz.Document]:
+    # パスと開いたままのPDFの両方を受け付ける（開いたままのPDFは閉じずに呼び出し側に任せる）
+    if isinstance(pdf, fitz.Document):
+        yield pdf
+        return
 
-def convert_pdf_to_images(pdf_path: Path, dpi: int = 300) -> List[fitz.Pixmap]:
+    if not pdf.exists():
+        raise FileNotFoundError(f"PDFファイルが見つかりません: {pdf}")
+    with fitz.open(pdf) as pdf_document:
+        yield pdf_document
+
+
+def convert_pdf_to_images(
+    pdf: PDFSource, dpi: int = 300, num_workers: Optional[int] = None, colorspace: str = "rgb"
+) -> Iterator[fitz.Pixmap]:
     logger = logging.getLogger(__name__)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDFファイルが見つかりません: {pdf_path}")
+    if not isinstance(pdf, fitz.Document) and not pdf.exists():
+        raise FileNotFoundError(f"PDFファイルが見つかりません: {pdf}")
 
-    logger.info(f"PDFファイルを開きます: {pdf_path}")
+    logger.info(f"PDFファイルを開きます: {pdf.name if isinstance(pdf, fitz.Document) else pdf}")
     logger.info(f"DPI設定: {dpi}")
 
+    # 全ページを一度に保持しないよう、1ページずつ画像化して返すジェネレータを返す
+    # num_workersが2以上の場合は複数プロセスで画像化する（省略時はCPUコア数、最大RENDER_WORKERS_DEFAULT_MAX）
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, RENDER_WORKERS_DEFAULT_MAX)
+    if num_workers > 1 and can_reopen_from_file(pdf):
+        return _generate_page_images_in_parallel(pdf, dpi, num_workers, colorspace)
+    return iter_pdf_pages(pdf, dpi, colorspace)
+
+
+def can_reopen_from_file(pdf: PDFSource) -> bool:
+    # 並列画像化の各ワーカーはPDFをファイルから開き直すため、開き直しても同じ内容になる場合のみTrueを返す
+    # 開いたままの文書は、メモリ上のデータから開いた場合、メモリ上で変更されている場合、
+    # パスワードで認証して開いている場合は対象外とする
+    if not isinstance(pdf, fitz.Document):
+        return True
+    return pdf.stream is None and bool(pdf.name) and not pdf.is_dirty and not pdf.needs_pass
+
+
+def iter_pdf_pages(pdf: PDFSource, dpi: int = 300, colorspace: str = "rgb") -> Iterator[fitz.Pixmap]:
+    # 1プロセスでページを順に画像化し、1ページずつ返す（呼び出し側はページごとに処理して破棄できる）
+    logger = logging.getLogger(__name__)
     try:
-        pdf_document = fitz.open(pdf_path)
-        logger.info(f"PDFページ数: {pdf_document.page_count}")
-        pixmaps = []
-
-        for page_num in range(pdf_document.page_count):
-            logger.debug(f"ページ {page_num + 1}/{pdf_document.page_count} を処理中...")
-            page = pdf_document[page_num]
-            mat = fitz.Matrix(dpi / 72.0, dpi / 72.0)
-            pix = page.get_pixmap(matrix=mat)
-            pixmaps.append(pix)
-            logger.debug(f"ページ {page_num + 1}: {pix.width}x{pix.height} pixels, {pix.n}チャンネル")
+        with _open_pdf(pdf) as pdf_document:
+            logger.info(f"PDFページ数: {pdf_document.page_count}")
+
+            for page_num in range(pdf_document.page_count):
+                logger.debug(f"ページ {page_num + 1}/{pdf_document.page_count} を処理中...")
+                pix = render_page_to_image(pdf_document, page_num, dpi, colorspace)
+                logger.debug(f"ページ {page_num + 1}: {pix.width}x{pix.height} pixels, {pix.n}チャンネル")
+                yield pix
 
-        pdf_document.close()
-        logger.info(f"PDF変換完了: {len(pixmaps)} ページ")
-        return pixmaps
+            logger.info(f"PDF変換完了: {pdf_document.page_count} ページ")
 
     except Exception as e:
         logger.error(f"PDF変換エラー: {e}")
         raise
 
 
-def convert_single_page_to_image(pdf_path: Path, page_number: int, dpi: int = 300) -> fitz.Pixmap:
+def _generate_page_images_in_parallel(
+    pdf: PDFSource, dpi: int, num_workers: int, colorspace: str = "rgb"
+) -> Iterator[fitz.Pixmap]:
     logger = logging.getLogger(__name__)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDFファイルが見つかりません: {pdf_path}")
-
     try:
-        pdf_document = fitz.open(pdf_path)
-        if page_number < 0 or page_number >= pdf_document.page_count:
-            raise ValueError(f"無効なページ番号: {page_number} (総ページ数: {pdf_document.page_count})")
-
-        page = pdf_document[page_number]
-        mat = fitz.Matrix(dpi / 72.0, dpi / 72.0)
-        pix = page.get_pixmap(matrix=mat)
-        pdf_document.close()
+        with _open_pdf(pdf) as pdf_document:
+            page_count = pdf_document.page_count
+            pdf_path = Path(pdf_document.name)
+        logger.info(f"PDFページ数: {page_count} ({num_workers}プロセスで画像化)")
+
+        for page_num, pix, error in render_pages_in_parallel(pdf_path, range(page_count), dpi, num_workers, colorspace):
+            if error is not None:
+                raise error
+            logger.debug(f"ページ {page_num + 1}: {pix.width}x{pix.height} pixels, {pix.n}チャンネル")
+            yield pix
 
-        logger.debug(f"ページ {page_number + 1}: {pix.width}x{pix.height} pixels")
-        return pix
+        logger.info(f"PDF変換完了: {page_count} ページ")
 
     except Exception as e:
-        logger.error(f"ページ {page_number + 1} の変換エラー: {e}")
+        logger.error(f"PDF変換エラー: {e}")
         raise
 
 
-def get_pdf_info(pdf_path: Path) -> dict:
+def convert_single_page_to_image(
+    pdf: PDFSource, page_number: int, dpi: int = 300, colorspace: str = "rgb"
+) -> fitz.Pixmap:
+    logger = logging.getLogger(__name__)
+    with _open_pdf(pdf) as pdf_document:
+        try:
+            return render_page_to_image(pdf_document, page_number, dpi, colorspace)
+
+        except Exception as e:
+            logger.error(f"ページ {page_number + 1} の変換エラー: {e}")
+            raise
+
+
+def render_page_to_image(
+    pdf_document: fitz.Document, page_number: int, dpi: int = 300, colorspace: str = "rgb"
+) -> fitz.Pixmap:
+    # 開いたままのPDFからページを画像化する（複数ページを処理する際にPDFを毎回開き直さないため）
     logger = logging.getLogger(__name__)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDFファイルが見つかりません: {pdf_path}")
+    if page_number < 0 or page_number >= pdf_document.page_count:
+        raise ValueError(f"無効なページ番号: {page_number} (総ページ数: {pdf_document.page_count})")
+    if colorspace == AUTO_COLORSPACE:
+        colorspace = detect_page_colorspace(pdf_document, page_number)
+    elif colorspace not in PAGE_COLORSPACES:
+        raise ValueError(f"無効な色空間: {colorspace} (指定可能: {', '.join([*PAGE_COLORSPACES, AUTO_COLORSPACE])})")
+
+    page = pdf_document[page_number]
+    # dpiを直接指定すると拡大行列の作成を省略でき、Pixmapに解像度情報も設定される
+    # OCRと検索可能なPDFの作成はアルファチャンネルを使用しないため、アルファチャンネルなしで画像化する
+    pix = page.get_pixmap(dpi=dpi, colorspace=PAGE_COLORSPACES[colorspace], alpha=False)
+    limit_mupdf_store()
+
+    logger.debug(f"ページ {page_number + 1}: {pix.width}x{pix.height} pixels ({colorspace})")
+    return pix
+
+
+def detect_page_colorspace(pdf_document: fitz.Document, page_number: int = 0) -> str:
+    # 低解像度で画像化したページのチャンネル間の差から、グレースケールで画像化してよいかを判定する
+    # スキャン画像の色ノイズを許容するため、色付きの画素がごく少数であればグレースケールとみなす
+    if pdf_document.page_count == 0:
+        return "rgb"
+    pix = pdf_document[page_number].get_pixmap(dpi=GRAYSCALE_CHECK_DPI, colorspace=fitz.csRGB, alpha=False)
+    pixels = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride // 3, 3)[:, : pix.width]
+    channel_diff = pixels.max(axis=2) - pixels.min(axis=2)
+    color_pixels = np.count_nonzero(channel_diff > GRAYSCALE_MAX_CHANNEL_DIFF)
+    return "gray" if color_pixels <= channel_diff.size * GRAYSCALE_MAX_COLOR_RATIO else "rgb"
+
+
+def limit_mupdf_store() -> None:
+    # MuPDFのキャッシュ（フォントや描画済み画像）はPyMuPDFでは上限がなく、ページを処理するほど増え続けるため、
+    # 一定ページごとに空にする（ページ間で共有されるリソースを毎ページ読み込み直さないよう、毎回は行わない）
+    global _pages_since_store_shrink
+    _pages_since_store_shrink += 1
+    if _pages_since_store_shrink >= MUPDF_STORE_SHRINK_INTERVAL:
+        fitz.TOOLS.store_shrink(100)
+        _pages_since_store_shrink = 0
+
+
+# 検索可能なPDFの作成中に、作成途中の文書を一時ファイルへ保存して開き直す間隔（ページ数）
+SEARCHABLE_PDF_FLUSH_INTERVAL = 16
+
+# 検索可能なPDFに埋め込むページ画像のJPEG品質（Noneの場合は可逆圧縮で埋め込む）
+PAGE_IMAGE_JPEG_QUALITY = 85
+
+# 画像化ワーカープロセスごとに開いたままにするPDF（PDFはワーカーごとに1回だけ開く）
+_worker_document: Optional[fitz.Document] = None
+
+
+def _init_render_worker(pdf_path: str) -> None:
+    global _worker_document
+    _worker_document = fitz.open(pdf_path)
+
+
+def _render_page_in_worker(page_number: int, dpi: int, colorspace: str) -> Tuple[int, int, int, bool, bytes]:
+    # fitz.Pixmapはpickleできないため、サイズ情報と生の画素データを返す
+    pix = render_page_to_image(_worker_document, page_number, dpi, colorspace)
+    return pix.width, pix.height, pix.n, bool(pix.alpha), pix.samples
+
+
+def render_pages_in_parallel(
+    pdf_path: Path, page_numbers: Iterable[int], dpi: int = 300, num_workers: int = 2, colorspace: str = "rgb"
+) -> Iterator[Tuple[int, Optional[fitz.Pixmap], Optional[Exception]]]:
+    # 複数プロセスでページを画像化し、(ページ番号, Pixmap, 例外) をページ順に返す
+    # 先行して画像化するページはワーカー数の2倍までとし、呼び出し側の処理を大きく追い越さないようにする
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_render_worker, initargs=(str(pdf_path),)
+    ) as executor:
+        pending = deque()
+        page_iter = iter(page_numbers)
+        try:
+            for page_number in page_iter:
+                try:
+                    future = executor.submit(_render_page_in_worker, page_number, dpi, colorspace)
+                except Exception as e:
+                    # プロセスプールが使用できなくなった場合（BrokenProcessPoolなど）は、投入済みのページの結果を返した後、
+                    # 残りの全ページを同じ例外による失敗として返す
+                    while pending:
+                        yield _collect_rendered_page(*pending.popleft())
+                    yield page_number, None, e
+                    for remaining_page_number in page_iter:
+                        yield remaining_page_number, None, e
+                    return
+                pending.append((page_number, future))
+                if len(pending) < num_workers * 2:
+                    continue
+                yield _collect_rendered_page(*pending.popleft())
+            while pending:
+                yield _collect_rendered_page(*pending.popleft())
+        finally:
+            # 途中で打ち切られた場合は、未着手のページを破棄する
+            for _, future in pending:
+                future.cancel()
 
+
+def _collect_rendered_page(page_number: int, future) -> Tuple[int, Optional[fitz.Pixmap], Optional[Exception]]:
     try:
-        pdf_document = fitz.open(pdf_path)
-        info = {
-            "page_count": pdf_document.page_count,
-            "is_encrypted": pdf_document.is_encrypted,
-            "metadata": pdf_document.metadata,
-            "page_sizes": [],
-        }
-
-        for page_num in range(pdf_document.page_count):
-            page = pdf_document[page_num]
-            info["page_sizes"].append({"page": page_num + 1, "width": page.rect.width, "height": page.rect.height})
-
-        pdf_document.close()
-        logger.info(f"PDF情報取得完了: {info['page_count']} ページ")
-        return info
+        width, height, n, alpha, samples = future.result()
+    except Exception as e:
+        return page_number, None, e
+    colorspace = fitz.csGRAY if n - alpha == 1 else fitz.csRGB
+    return page_number, fitz.Pixmap(colorspace, width, height, samples, alpha), None
+
+
+def get_pdf_info(pdf: PDFSource) -> dict:
+    logger = logging.getLogger(__name__)
+    with _open_pdf(pdf) as pdf_document:
+        try:
+            return get_document_info(pdf_document)
+
+        except Exception as e:
+            logger.error(f"PDF情報取得エラー: {e}")
+            raise
+
+
+def get_document_info(pdf_document: fitz.Document) -> dict:
+    # 開いたままのPDFから情報を取得する（同じPDFを後続の処理で開き直さないため）
+    logger = logging.getLogger(__name__)
+    info = {
+        "page_count": pdf_document.page_count,
+        "is_encrypted": pdf_document.is_encrypted,
+        "metadata": pdf_document.metadata,
+        "page_sizes": [],
+    }
 
+    for page_num in range(pdf_document.page_count):
+        page = pdf_document[page_num]
+        info["page_sizes"].append({"page": page_num + 1, "width": page.rect.width, "height": page.rect.height})
+
+    logger.info(f"PDF情報取得完了: {info['page_count']} ページ")
+    return info
+
+
+@lru_cache(maxsize=None)
+def _get_font(fontname: str) -> fitz.Font:
+    # フォントの読み込みはページごとに行わず、全ページで共有する
+    return fitz.Font(fontname)
+
+
+@lru_cache(maxsize=8)
+def _pdf_page_size(width: int, height: int, dpi: int) -> Tuple[float, float]:
+    # ページ画像のサイズ（px）をPDFのページサイズ（pt）に変換する（スキャン文書は全ページ同じサイズのため使い回す）
+    return width * 72.0 / dpi, height * 72.0 / dpi
+
+
+def _write_invisible_text(page: fitz.Page, text_writer: fitz.TextWriter) -> bool:
+    # TextWriterにまとめたテキストを透明テキスト（render_mode=3）としてページに書き込む
+    try:
+        text_writer.write_text(page, color=(1, 1, 1), render_mode=3)
+        return True
     except Exception as e:
-        logger.error(f"PDF情報取得エラー: {e}")
-        raise
+        logging.getLogger(__name__).warning(f"テキストの書き込みに失敗: {e}")
+        return False
 
 
-def create_searchable_pdf_page(pixmap: fitz.Pixmap, ocr_result: PageOCRResult, dpi: int = 300) -> fitz.Document:
+def insert_page_image(
+    page: fitz.Page, pixmap: fitz.Pixmap, jpeg_quality: Optional[int] = PAGE_IMAGE_JPEG_QUALITY
+) -> None:
+    # JPEGにエンコードしたデータを渡すと、MuPDFは再エンコードせずにそのまま（DCTDecodeとして）埋め込む
+    # アルファチャンネルを持つ画像はJPEGにできないため、従来どおりPixmapを渡して可逆圧縮で埋め込む
+    if jpeg_quality is None or pixmap.alpha:
+        page.insert_image(page.rect, pixmap=pixmap)
+    else:
+        page.insert_image(page.rect, stream=pixmap.tobytes("jpeg", jpg_quality=jpeg_quality))
+
+
+def create_searchable_pdf_page(
+    pixmap: fitz.Pixmap,
+    ocr_result: PageOCRResult,
+    dpi: int = 300,
+    jpeg_quality: Optional[int] = PAGE_IMAGE_JPEG_QUALITY,
+    doc: Optional[fitz.Document] = None,
+) -> fitz.Document:
+    # docを渡した場合は、1ページの文書を作ってからinsert_pdfで複製せずに、docの末尾へ直接ページを作成する
+    # （同じ文書内ではフォントや同一画像が共有される）
     logger = logging.getLogger(__name__)
     try:
-        doc = fitz.open()
+        if doc is None:
+            doc = fitz.open()
         logger.info(f"ページ {ocr_result.page_number}: Pixmapサイズ {pixmap.width}x{pixmap.height} px")
         logger.info(
             f"ページ {ocr_result.page_number}: OCR結果サイズ {ocr_result.page_width}x{ocr_result.page_height} px"
         )
 
-        pdf_width = pixmap.width * 72.0 / dpi
-        pdf_height = pixmap.height * 72.0 / dpi
+        pdf_width, pdf_height = _pdf_page_size(pixmap.width, pixmap.height, dpi)
         logger.info(f"ページ {ocr_result.page_number}: PDFサイズ {pdf_width:.1f}x{pdf_height:.1f} points")
 
         page = doc.new_page(width=pdf_width, height=pdf_height)
-        page.insert_image(page.rect, pixmap=pixmap)
+        insert_page_image(page, pixmap, jpeg_quality)
 
-        if ocr_result.text_blocks:
-            logger.debug(
-                f"ページ {ocr_result.page_number}: {len(ocr_result.text_blocks)}個のテキストブロックを処理中..."
-            )
+        if ocr_result.text_count:
+            logger.debug(f"ページ {ocr_result.page_number}: {ocr_result.text_count}個のテキストブロックを処理中...")
 
             x_scale = pdf_width / ocr_result.page_width
             y_scale = pdf_height / ocr_result.page_height
             logger.debug(f"座標変換スケール: x={x_scale:.3f}, y={y_scale:.3f}")
 
-            for i, text_block in enumerate(ocr_result.text_blocks):
+            # 全テキストブロックを1つのTextWriterにまとめ、ページへの書き込みは最後に1回だけ行う
+            # 座標変換とフォントサイズの計算は全テキストブロック分を配列演算でまとめて行う
+            scaled = ocr_result.bboxes * np.array([x_scale, y_scale, x_scale, y_scale])
+            text_heights = scaled[:, 3] - scaled[:, 1]
+            too_small = (scaled[:, 2] - scaled[:, 0] < 1) | (text_heights < 1)
+            font_sizes = np.clip(text_heights * 0.8, 6, 12)
+            vertical = np.fromiter((d == "vertical" for d in ocr_result.directions), dtype=bool, count=len(scaled))
+            font_sizes = np.where(vertical, font_sizes * VERTICAL_FONT_SCALE, font_sizes)
+            text_ys = scaled[:, 1] + font_sizes
+            debug = logger.isEnabledFor(logging.DEBUG)
+            select_font = page_font_selector(ocr_result.texts)
+
+            text_writer = fitz.TextWriter(page.rect)
+            append_text = text_writer.append
+            for i, (text, direction, (x0, y0, x1, y1), font_size, text_y, skip) in enumerate(
+                zip(
+                    ocr_result.texts,
+                    ocr_result.directions,
+                    scaled.tolist(),
+                    font_sizes.tolist(),
+                    text_ys.tolist(),
+                    too_small.tolist(),
+                )
+            ):
                 try:
-                    x0, y0, x1, y1 = (
-                        text_block.bbox.x0 * x_scale,
-                        text_block.bbox.y0 * y_scale,
-                        text_block.bbox.x1 * x_scale,
-                        text_block.bbox.y1 * y_scale,
-                    )
-                    text_width, text_height = x1 - x0, y1 - y0
-
-                    if text_width < 1 or text_height < 1:
-                        logger.debug(f"テキストブロック {i + 1}: サイズが小さすぎるためスキップ")
+                    if skip:
+                        if debug:
+                            logger.debug(f"テキストブロック {i + 1}: サイズが小さすぎるためスキップ")
                         continue
 
-                    font_size = min(text_height * 0.8, 12)
-                    font_size = max(font_size, 6)
-                    font_size = adjust_font_size_for_direction(font_size, text_block.direction)
-
-                    fontname = select_appropriate_font(text_block.text)
-                    logger.debug(
-                        f"テキストブロック {i + 1}: フォント='{fontname}', サイズ={font_size:.1f}, 方向={text_block.direction}"
-                    )
-
-                    text_y = y0 + font_size
-                    page.insert_text(
-                        (x0, text_y),
-                        text_block.text,
-                        fontsize=font_size,
-                        fontname=fontname,
-                        color=(1, 1, 1),
-                        render_mode=3,
-                    )
-
-                    # 詳細なデバッグ情報
-                    logger.debug(
-                        f"埋め込み完了 {i+1}/{len(ocr_result.text_blocks)}: '{text_block.text[:50]}...' at ({x0:.1f},{y0:.1f}) font={fontname} size={font_size:.1f}"
-                    )
-
-                    logger.debug(
-                        f"テキストブロック {i + 1}/{len(ocr_result.text_blocks)}: "
-                        f"'{text_block.text[:20]}...' をPDF座標 ({x0:.1f}, {y0:.1f}, {x1:.1f}, {y1:.1f}) に挿入"
-                    )
+                    fontname = select_font(text)
+                    append_text((x0, text_y), text, font=_get_font(fontname), fontsize=font_size)
+
+                    # 詳細なデバッグ情報（ログの文字列はデバッグ出力時のみ作成する）
+                    if debug:
+                        logger.debug(
+                            f"テキストブロック {i + 1}/{ocr_result.text_count}: '{text[:20]}...' を"
+                            f"PDF座標 ({x0:.1f}, {y0:.1f}, {x1:.1f}, {y1:.1f}) に挿入 "
+                            f"(フォント: {fontname}, サイズ: {font_size:.1f}, 方向: {direction})"
+                        )
 
                 except Exception as e:
                     logger.warning(f"テキストブロック {i + 1} の埋め込みに失敗: {e}")
                     continue
 
+            _write_invisible_text(page, text_writer)
+
         logger.info(f"ページ {ocr_result.page_number}: 検索可能なPDFページの作成が完了")
         return doc
 
@@ -191,7 +425,12 @@ def create_searchable_pdf_page(pixmap: fitz.Pixmap, ocr_result: PageOCRResult, d
 
 
 def create_searchable_pdf(
-    pixmaps: List[fitz.Pixmap], ocr_results: List[PageOCRResult], output_path: Path, dpi: int = 300
+    pixmaps: List[fitz.Pixmap],
+    ocr_results: List[PageOCRResult],
+    output_path: Path,
+    dpi: int = 300,
+    jpeg_quality: Optional[int] = PAGE_IMAGE_JPEG_QUALITY,
+    fast_save: bool = False,
 ) -> None:
     logger = logging.getLogger(__name__)
     if len(pixmaps) != len(ocr_results):
@@ -209,22 +448,19 @@ def create_searchable_pdf(
                 logger.warning(f"ページ {i + 1}: OCR失敗のため画像のみでページ作成")
                 empty_result = PageOCRResult(
                     page_number=i + 1,
-                    text_blocks=[],
                     page_width=float(pixmap.width),
                     page_height=float(pixmap.height),
                     success=True,
                     error=None,
                     processing_time=0.0,
                 )
-                page_doc = create_searchable_pdf_page(pixmap, empty_result, dpi)
+                create_searchable_pdf_page(pixmap, empty_result, dpi, jpeg_quality, doc=final_doc)
             else:
-                page_doc = create_searchable_pdf_page(pixmap, ocr_result, dpi)
-
-            final_doc.insert_pdf(page_doc)
-            page_doc.close()
+                create_searchable_pdf_page(pixmap, ocr_result, dpi, jpeg_quality, doc=final_doc)
 
         logger.info(f"PDFファイルを保存中: {output_path}")
-        final_doc.save(output_path, garbage=4, deflate=True, clean=True)
+        _subset_fonts(final_doc)
+        final_doc.save(output_path, **_pdf_save_options(fast_save))
         final_doc.close()
 
         logger.info(f"検索可能なPDF作成完了: {output_path}")
@@ -238,6 +474,10 @@ def create_searchable_pdf(
 def embed_ocr_text_blocks(page: fitz.Page, text_blocks: List[dict], x_scale: float, y_scale: float) -> int:
     logger = logging.getLogger(__name__)
     embedded_count = 0
+    text_writer = fitz.TextWriter(page.rect)
+    append_text = text_writer.append
+    select_font = page_font_selector(block.get("text", "") for block in text_blocks)
+    debug = logger.isEnabledFor(logging.DEBUG)
 
     for i, block in enumerate(text_blocks):
         try:
@@ -253,63 +493,177 @@ def embed_ocr_text_blocks(page: fitz.Page, text_blocks: List[dict], x_scale: flo
                 continue
 
             direction = block.get("direction", "horizontal")
-            font_size = max(min(text_height * 0.8, 12), 6)
+            font_size = text_height * 0.8
+            font_size = 6.0 if font_size < 6 else (12.0 if font_size > 12 else font_size)
             font_size = adjust_font_size_for_direction(font_size, direction)
-            fontname = select_appropriate_font(text)
+            fontname = select_font(text)
 
-            text_y = y0 + font_size
-            page.insert_text((x0, text_y), text, fontsize=font_size, fontname=fontname, color=(1, 1, 1), render_mode=3)
+            append_text((x0, y0 + font_size), text, font=_get_font(fontname), fontsize=font_size)
 
             embedded_count += 1
-            logger.debug(f"テキスト埋め込み {i + 1}: '{text[:20]}...' (フォント: {fontname})")
+            if debug:
+                logger.debug(f"テキスト埋め込み {i + 1}: '{text[:20]}...' (フォント: {fontname})")
 
         except Exception as e:
             logger.warning(f"テキストブロック {i + 1} の埋め込みに失敗: {e}")
             continue
 
+    if not _write_invisible_text(page, text_writer):
+        return 0
     return embedded_count
 
 
 def create_memory_efficient_searchable_pdf(
-    input_pdf_path: Path, ocr_results: List[PageOCRResult], output_path: Path, dpi: int = 300
+    input_pdf_path: Path,
+    ocr_results: Iterable[PageOCRResult],
+    output_path: Path,
+    dpi: int = 300,
+    pdf_document: Optional[fitz.Document] = None,
+    jpeg_quality: Optional[int] = PAGE_IMAGE_JPEG_QUALITY,
+    fast_save: bool = False,
+    colorspace: str = "rgb",
 ) -> None:
     logger = logging.getLogger(__name__)
     logger.info(f"メモリ効率的な検索可能PDF作成を開始: {input_pdf_path}")
 
     try:
-        final_doc = fitz.open()
+        # 開いたままのPDFが渡された場合はそれを使用し、閉じるのは呼び出し側に任せる
+        with _open_pdf(pdf_document if pdf_document is not None else input_pdf_path) as source_doc:
+            with SearchablePDFWriter(output_path, dpi, jpeg_quality=jpeg_quality, fast_save=fast_save) as writer:
+                for page_result in ocr_results:
+                    logger.info(f"ページ {page_result.page_number} を処理中...")
 
-        for page_result in ocr_results:
-            logger.info(f"ページ {page_result.page_number} を処理中...")
+                    pixmap = render_page_to_image(source_doc, page_result.page_number - 1, dpi, colorspace)
+                    writer.add_page(pixmap, page_result)
+                    del pixmap
 
-            pixmap = convert_single_page_to_image(input_pdf_path, page_result.page_number - 1, dpi)
+                writer.close()
 
-            if page_result.success and page_result.text_blocks:
-                page_doc = create_searchable_pdf_page(pixmap, page_result, dpi)
-            else:
-                logger.warning(f"ページ {page_result.page_number}: OCR失敗のため画像のみでページ作成")
-                empty_result = PageOCRResult(
-                    page_number=page_result.page_number,
-                    text_blocks=[],
-                    page_width=float(pixmap.width),
-                    page_height=float(pixmap.height),
-                    success=True,
-                    error=None,
-                    processing_time=0.0,
-                )
-                page_doc = create_searchable_pdf_page(pixmap, empty_result, dpi)
+    except Exception as e:
+        logger.error(f"メモリ効率的な検索可能PDF作成中にエラーが発生しました: {e}")
+        raise
 
-            final_doc.insert_pdf(page_doc)
-            page_doc.close()
-            del pixmap
 
-        logger.info(f"PDFファイルを保存中: {output_path}")
-        final_doc.save(output_path, garbage=4, deflate=True, clean=True)
-        final_doc.close()
+def append_searchable_pdf_page(
+    final_doc: fitz.Document,
+    pixmap: fitz.Pixmap,
+    page_result: PageOCRResult,
+    dpi: int = 300,
+    jpeg_quality: Optional[int] = PAGE_IMAGE_JPEG_QUALITY,
+) -> None:
+    # ページ画像とOCR結果から検索可能なページを作成し、final_docの末尾に追加する
+    # OCR処理で使用したページ画像を渡せば、PDF作成のためにページを画像化し直す必要はない
+    logger = logging.getLogger(__name__)
+    if page_result.success and page_result.text_count:
+        create_searchable_pdf_page(pixmap, page_result, dpi, jpeg_quality, doc=final_doc)
+    else:
+        logger.warning(f"ページ {page_result.page_number}: OCR失敗のため画像のみでページ作成")
+        empty_result = PageOCRResult(
+            page_number=page_result.page_number,
+            page_width=float(pixmap.width),
+            page_height=float(pixmap.height),
+            success=True,
+            error=None,
+            processing_time=0.0,
+        )
+        create_searchable_pdf_page(pixmap, empty_result, dpi, jpeg_quality, doc=final_doc)
+
+
+class SearchablePDFWriter:
+    # 検索可能なPDFをページ単位で作成し、output_pathへ保存するクラス
+    # 作成中の文書は一定ページごとに一時ファイルへ圧縮保存して開き直し、ページ画像の非圧縮データをメモリに溜めない
+    # （開き直した文書のページ内容はファイルから必要な時に読み込まれる）
+
+    def __init__(
+        self,
+        output_path: Path,
+        dpi: int = 300,
+        flush_interval: int = SEARCHABLE_PDF_FLUSH_INTERVAL,
+        jpeg_quality: Optional[int] = PAGE_IMAGE_JPEG_QUALITY,
+        fast_save: bool = False,
+    ):
+        self.output_path = output_path
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self.fast_save = fast_save
+        self.flush_interval = flush_interval
+        self.page_count = 0
+        self.doc = fitz.open()
+        # 開いている文書のファイルへは上書き保存できないため、2つの一時ファイルを交互に使用する
+        self._tmp_paths = [output_path.with_name(f"{output_path.name}.part{i}") for i in range(2)]
+        self._tmp_index = 0
+
+    def __enter__(self) -> "SearchablePDFWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # 正常に保存されなかった場合は作成途中の文書と一時ファイルを破棄する
+        self.discard()
+
+    def add_page(self, pixmap: fitz.Pixmap, page_result: PageOCRResult) -> None:
+        append_searchable_pdf_page(self.doc, pixmap, page_result, self.dpi, self.jpeg_quality)
+        self._page_added()
+
+    def add_source_page(self, source_doc: fitz.Document, page_index: int) -> None:
+        # ページ画像を用意できなかったページは、入力PDFのページをそのまま複製して追加する（OCRテキストは埋め込まない）
+        self.doc.insert_pdf(source_doc, from_page=page_index, to_page=page_index)
+        self._page_added()
+
+    def _page_added(self) -> None:
+        self.page_count += 1
+
+        # MuPDFのキャッシュ（描画済みの画像データなど）が溜まり続けないようにする
+        limit_mupdf_store()
+
+        if self.flush_interval > 0 and self.page_count % self.flush_interval == 0:
+            self._flush()
+
+    def _flush(self) -> None:
+        tmp_path = self._tmp_paths[self._tmp_index]
+        self.doc.save(tmp_path, garbage=4, deflate=True)
+        self.doc.close()
+        self.doc = fitz.open(tmp_path)
+
+        # 前回の一時ファイルは開いている文書から参照されなくなったため削除する
+        self._tmp_index = 1 - self._tmp_index
+        self._tmp_paths[self._tmp_index].unlink(missing_ok=True)
+        logging.getLogger(__name__).debug(f"作成中のPDFを一時ファイルへ保存しました: {self.page_count}ページ")
+
+    def close(self) -> None:
+        save_searchable_pdf(self.doc, self.output_path, fast_save=self.fast_save)
+        self.discard()
+
+    def discard(self) -> None:
+        if not self.doc.is_closed:
+            self.doc.close()
+        for tmp_path in self._tmp_paths:
+            tmp_path.unlink(missing_ok=True)
+
+
+def _subset_fonts(doc: fitz.Document) -> None:
+    # TextWriterはフォント全体を埋め込むため、保存前に使用文字のみのサブセットに置き換える
+    try:
+        doc.subset_fonts()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"フォントのサブセット化に失敗しました: {e}")
 
-        logger.info(f"メモリ効率的な検索可能PDF作成完了: {output_path}")
-        logger.info(f"ファイルサイズ: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
 
-    except Exception as e:
-        logger.error(f"メモリ効率的な検索可能PDF作成中にエラーが発生しました: {e}")
-        raise
+def _pdf_save_options(fast_save: bool) -> dict:
+    # 高速保存では重複オブジェクトの統合とコンテンツストリームの整理を省略する
+    # ページ画像はJPEG（またはFlate）で圧縮済みのため、画像の再圧縮も行わない
+    # 通常の保存では、圧縮されていない画像やフォントが含まれている場合もそれらを圧縮する
+    # （MuPDF 1.26以降はリニアライズに対応していないため、linearは指定しない）
+    if fast_save:
+        return dict(garbage=1, deflate=True, clean=False, deflate_images=False)
+    return dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, clean=True)
+
+
+def save_searchable_pdf(final_doc: fitz.Document, output_path: Path, fast_save: bool = False) -> None:
+    logger = logging.getLogger(__name__)
+    logger.info(f"PDFファイルを保存中: {output_path}")
+    _subset_fonts(final_doc)
+    final_doc.save(output_path, **_pdf_save_options(fast_save))
+    final_doc.close()
+
+    logger.info(f"メモリ効率的な検索可能PDF作成完了: {output_path}")
+    logger.info(f"ファイルサイズ: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
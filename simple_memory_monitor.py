@@ -7,54 +7,89 @@
 
 import gc
 import logging
+import os
+import sys
 import tracemalloc
 from typing import Optional
 
+# 要約・差分の集計前に除外するトレース（インポート処理やtracemalloc自身による確保は調査対象外）
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, "<frozen *>"),
+    tracemalloc.Filter(False, "<unknown>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+def get_process_memory_mb() -> Optional[float]:
+    """
+    現在のプロセスの物理メモリ使用量（RSS）をMB単位で取得
+
+    Linuxでは/proc/self/statmを読み取ります（数マイクロ秒で完了し、処理中の呼び出しにも影響しません）。
+    /procがない環境ではresourceモジュールのピーク使用量で代用し、どちらも使用できない場合はNoneを返します。
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+
+        # ru_maxrssの単位はmacOSではバイト、Linuxなどではキロバイト
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+    except Exception:
+        return None
+
 
 class SimpleMemoryMonitor:
-    """標準ライブラリのみを使用するシンプルなメモリ監視クラス"""
+    """
+    標準ライブラリのみを使用するシンプルなメモリ監視クラス
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    通常はプロセスのRSSのみを計測します。trace_allocations=Trueの場合はtracemallocも使用し、
+    要約にメモリを多く確保しているファイルを出力します（全てのメモリ確保が遅くなるため、調査時のみ使用してください）。
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, trace_allocations: bool = False):
         self.logger = logger or logging.getLogger(__name__)
         self.peak_memory = 0
-        try:
-            # tracemalloc を開始
-            tracemalloc.start()
-            self.initial_snapshot = tracemalloc.take_snapshot()
-            self.tracemalloc_available = True
-        except Exception as e:
-            self.logger.warning(f"tracemalloc初期化に失敗しました: {e}")
-            self.tracemalloc_available = False
-            self.initial_snapshot = None
+        self.initial_memory = get_process_memory_mb()
+        self.tracemalloc_available = False
+        self.initial_snapshot = None
+        # 他で開始されたtracemallocは停止しないよう、自身で開始した場合のみ停止する
+        self._started_tracemalloc = False
+        if trace_allocations:
+            try:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracemalloc = True
+                self.initial_snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+                self.tracemalloc_available = True
+            except Exception as e:
+                self.logger.warning(f"tracemalloc初期化に失敗しました: {e}")
 
     def log_memory_usage(self, context: str = ""):
-        """メモリ使用量をログ出力（tracemalloc使用）"""
-        if not self.tracemalloc_available:
-            self.logger.debug(f"メモリ監視 [{context}]: tracemalloc無効")
+        """メモリ使用量（RSS）をログ出力"""
+        total_mb = get_process_memory_mb()
+        if total_mb is None:
+            self.logger.debug(f"メモリ監視 [{context}]: メモリ使用量を取得できません")
             return
 
-        try:
-            # 現在のスナップショットを取得
-            current_snapshot = tracemalloc.take_snapshot()
-
-            # メモリ使用量の統計を取得
-            stats = current_snapshot.statistics("lineno")
-
-            # 総メモリ使用量を計算
-            total_size = sum(stat.size for stat in stats)
-            total_mb = total_size / 1024 / 1024
-
-            # ピークメモリを更新
-            if total_mb > self.peak_memory:
-                self.peak_memory = total_mb
+        # ピークメモリを更新
+        if total_mb > self.peak_memory:
+            self.peak_memory = total_mb
 
-            self.logger.info(f"メモリ使用量 [{context}]: {total_mb:.1f}MB (ピーク: {self.peak_memory:.1f}MB)")
-
-        except Exception as e:
-            self.logger.error(f"メモリ使用量取得エラー: {e}")
+        self.logger.info(f"メモリ使用量 [{context}]: {total_mb:.1f}MB (ピーク: {self.peak_memory:.1f}MB)")
 
     def force_garbage_collection(self):
         """ガベージコレクションを強制実行"""
+        # gc.get_objects()は全オブジェクトのリストを作成するため、デバッグログ出力時のみ件数を数える
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            gc.collect()
+            return
+
         before_count = len(gc.get_objects())
         collected = gc.collect()
         after_count = len(gc.get_objects())
@@ -67,11 +102,12 @@ class SimpleMemoryMonitor:
         """メモリ使用量の要約をログ出力"""
         if not self.tracemalloc_available:
             self.logger.info("=== メモリ使用量要約 ===")
-            self.logger.info("tracemalloc無効のため詳細情報なし")
+            self.logger.info(f"ピークメモリ使用量: {self.peak_memory:.1f}MB")
             return
 
         try:
-            current_snapshot = tracemalloc.take_snapshot()
+            # 集計対象外のトレースをstatistics()のソート前に除外する
+            current_snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
 
             # 最も多くメモリを使用しているファイルのトップ10
             top_stats = current_snapshot.statistics("filename")[:10]
@@ -90,10 +126,13 @@ class SimpleMemoryMonitor:
     def get_memory_diff(self):
         """初期状態からのメモリ使用量の差分を取得"""
         if not self.tracemalloc_available or self.initial_snapshot is None:
-            return 0
+            current_memory = get_process_memory_mb()
+            if current_memory is None or self.initial_memory is None:
+                return 0
+            return current_memory - self.initial_memory
 
         try:
-            current_snapshot = tracemalloc.take_snapshot()
+            current_snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
             top_stats = current_snapshot.compare_to(self.initial_snapshot, "lineno")
 
             # 差分の統計
@@ -106,7 +145,7 @@ class SimpleMemoryMonitor:
 
     def __del__(self):
         """デストラクタでtracemalloc停止"""
-        if self.tracemalloc_available:
+        if self._started_tracemalloc:
             try:
                 tracemalloc.stop()
             except Exception:
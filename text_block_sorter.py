@@ -1,7 +1,13 @@
 import logging
-from typing import List, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
-from data_structures import BoundingBox, PageOCRResult, TextBlock
+import numpy as np
+
+from data_structures import NUMBA_AVAILABLE, BoundingBox, PageOCRResult, TextBlock
 
 
 def get_bbox_props(bbox):
@@ -10,17 +16,128 @@ def get_bbox_props(bbox):
 
 
 def is_horizontal_overlap(bbox1, bbox2, threshold=0.5):
-    lx1, _, rx1, _, _, _, w1, _ = get_bbox_props(bbox1)
-    lx2, _, rx2, _, _, _, w2, _ = get_bbox_props(bbox2)
-    overlap = max(0, min(rx1, rx2) - max(lx1, lx2))
-    return overlap >= w1 * threshold or overlap >= w2 * threshold
+    # BoundingBoxは幅・高さ・面積を生成時に計算して保持しているため、get_bbox_propsでタプルを作らずに属性を参照する
+    overlap = max(0, min(bbox1.x1, bbox2.x1) - max(bbox1.x0, bbox2.x0))
+    return overlap >= bbox1.width * threshold or overlap >= bbox2.width * threshold
 
 
 def is_vertical_overlap(bbox1, bbox2, threshold=0.5):
-    _, ty1, _, by1, _, _, _, h1 = get_bbox_props(bbox1)
-    _, ty2, _, by2, _, _, _, h2 = get_bbox_props(bbox2)
-    overlap = max(0, min(by1, by2) - max(ty1, ty2))
-    return overlap >= h1 * threshold or overlap >= h2 * threshold
+    overlap = max(0, min(bbox1.y1, bbox2.y1) - max(bbox1.y0, bbox2.y0))
+    return overlap >= bbox1.height * threshold or overlap >= bbox2.height * threshold
+
+
+# 文書全体のソートを複数プロセスで行う最小ページ数（少ないページ数ではプロセス起動の時間の方が長い）
+SORT_PARALLEL_MIN_PAGES = 32
+SORT_WORKERS_MAX = 8
+
+# ページを順に受け取りながらソートする場合に、まとめて並列処理するページ数（1プロセスあたり）
+SORT_STREAM_PAGES_PER_WORKER = 8
+
+# numbaを使用しない場合に、重なりの長さなどの中間の配列を一度に計算するブロック数
+# （分割されるのは浮動小数点数の中間配列のみで、結果の隣接行列はブロック数の2乗の大きさになる）
+_OVERLAP_CHUNK_SIZE = 512
+
+
+def _overlap_group_roots(starts: np.ndarray, ends: np.ndarray, threshold: float) -> np.ndarray:
+    # _find_overlap_groupsと同じ連結成分をUnion-Findで求め、各ブロックが属する成分の先頭のブロック番号を返す
+    # （_get_overlap_group_kernelでnopythonモードにコンパイルして使用。重なり判定の行列を作らないためメモリはブロック数に比例）
+    n = starts.shape[0]
+    parent = np.arange(n)
+
+    for i in range(n):
+        length_i = ends[i] - starts[i]
+        for j in range(i + 1, n):
+            overlap = min(ends[i], ends[j]) - max(starts[i], starts[j])
+            if overlap <= 0 or overlap < min(length_i, ends[j] - starts[j]) * threshold:
+                continue
+
+            root_i = i
+            while parent[root_i] != root_i:
+                parent[root_i] = parent[parent[root_i]]
+                root_i = parent[root_i]
+            root_j = j
+            while parent[root_j] != root_j:
+                parent[root_j] = parent[parent[root_j]]
+                root_j = parent[root_j]
+
+            # 番号の小さい方を根にすることで、根が成分の先頭のブロックになる
+            if root_i < root_j:
+                parent[root_j] = root_i
+            elif root_j < root_i:
+                parent[root_i] = root_j
+
+    for i in range(n):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        parent[i] = root
+    return parent
+
+
+@lru_cache(maxsize=None)
+def _get_overlap_group_kernel() -> Optional[Callable[..., np.ndarray]]:
+    # _overlap_group_rootsをJITコンパイルして返す（numbaを読み込めない場合はNone）
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_overlap_group_roots)
+
+
+def _find_overlap_groups(starts: np.ndarray, ends: np.ndarray, threshold: float = 0.5) -> List[List[int]]:
+    # 1つの軸上で重なるブロック同士を連結し、連結成分（列または行）ごとのブロック番号のリストを返す
+    # 重なりの長さがどちらかのブロックの長さのthreshold倍以上であれば連結する（重なりのないブロック同士は連結しない）
+    # 最初に見つかった列・行にだけ追加する方法と異なり、結果がブロックの処理順に左右されない
+    # 各グループのブロック番号は昇順、グループは先頭のブロック番号の順に並ぶ
+    kernel = _get_overlap_group_kernel() if NUMBA_AVAILABLE else None
+    if kernel is not None:
+        groups = {}
+        for i, root in enumerate(kernel(starts, ends, threshold).tolist()):
+            groups.setdefault(root, []).append(i)
+        return list(groups.values())
+
+    # 隣接行列はブロック数の2乗の真偽値（1要素1バイト）となるが、重なりの長さの計算は行を分割して一時配列を抑える
+    count = len(starts)
+    lengths = ends - starts
+    adjacency = np.empty((count, count), dtype=bool)
+    for chunk_start in range(0, count, _OVERLAP_CHUNK_SIZE):
+        rows = slice(chunk_start, chunk_start + _OVERLAP_CHUNK_SIZE)
+        overlaps = np.minimum(ends[rows, None], ends) - np.maximum(starts[rows, None], starts)
+        adjacency[rows] = (overlaps > 0) & (overlaps >= np.minimum(lengths[rows, None], lengths) * threshold)
+
+    # 幅優先探索で連結成分を求める（各ブロックは一度だけ探索の起点側になる）
+    labels = np.full(count, -1)
+    groups = []
+    for seed in range(count):
+        if labels[seed] >= 0:
+            continue
+        labels[seed] = len(groups)
+        members = [seed]
+        frontier = np.array([seed])
+        while frontier.size:
+            reached = np.flatnonzero(adjacency[frontier].any(axis=0) & (labels < 0))
+            labels[reached] = len(groups)
+            members.extend(reached.tolist())
+            frontier = reached
+        groups.append(sorted(members))
+    return groups
+
+
+def _sort_text_block_lines(text_blocks: List[TextBlock], vertical: bool) -> List[List[TextBlock]]:
+    # 縦書きは横方向に重なるブロックを列、横書きは縦方向に重なるブロックを行としてまとめ、
+    # 列は上から下へ・右の列から、行は左から右へ・上の行から並べる
+    bboxes = np.array([(b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1) for b in text_blocks], dtype=np.float64)
+    axis = 0 if vertical else 1
+    groups = _find_overlap_groups(bboxes[:, axis], bboxes[:, axis + 2])
+
+    # グループ内はソート順が同じブロックについて元の順序を保つ（安定ソート）
+    in_line_key = bboxes[:, 1] if vertical else bboxes[:, 0]
+    lines = [[text_blocks[i] for i in sorted(group, key=in_line_key.__getitem__)] for group in groups]
+
+    # グループの位置は、グループの先頭（元の順序で最初）のブロックの中心で決める
+    centers = (bboxes[:, axis] + bboxes[:, axis + 2]) / 2
+    line_order = sorted(range(len(groups)), key=lambda k: -centers[groups[k][0]] if vertical else centers[groups[k][0]])
+    return [lines[k] for k in line_order]
 
 
 def sort_vertical_text_blocks(text_blocks: List[TextBlock]) -> List[TextBlock]:
@@ -30,26 +147,10 @@ def sort_vertical_text_blocks(text_blocks: List[TextBlock]) -> List[TextBlock]:
 
     logger.debug(f"縦書きテキストブロック {len(text_blocks)} 個をソート中...")
 
-    columns = []
-    for block in text_blocks:
-        added = False
-        for column in columns:
-            if is_horizontal_overlap(block.bbox, column[0].bbox):
-                column.append(block)
-                added = True
-                break
-        if not added:
-            columns.append([block])
-
+    columns = _sort_text_block_lines(text_blocks, vertical=True)
     logger.debug(f"縦書きテキストで {len(columns)} 列を検出")
 
-    for column in columns:
-        column.sort(key=lambda b: get_bbox_props(b.bbox)[1])
-    columns.sort(key=lambda col: -get_bbox_props(col[0].bbox)[4])
-
-    result = []
-    for column in columns:
-        result.extend(column)
+    result = [block for column in columns for block in column]
 
     logger.debug(f"縦書きテキストブロックのソート完了: {len(result)} 個")
     return result
@@ -62,26 +163,10 @@ def sort_horizontal_text_blocks(text_blocks: List[TextBlock]) -> List[TextBlock]
 
     logger.debug(f"横書きテキストブロック {len(text_blocks)} 個をソート中...")
 
-    rows = []
-    for block in text_blocks:
-        added = False
-        for row in rows:
-            if is_vertical_overlap(block.bbox, row[0].bbox):
-                row.append(block)
-                added = True
-                break
-        if not added:
-            rows.append([block])
-
+    rows = _sort_text_block_lines(text_blocks, vertical=False)
     logger.debug(f"横書きテキストで {len(rows)} 行を検出")
 
-    for row in rows:
-        row.sort(key=lambda b: get_bbox_props(b.bbox)[0])
-    rows.sort(key=lambda row: get_bbox_props(row[0].bbox)[5])
-
-    result = []
-    for row in rows:
-        result.extend(row)
+    result = [block for row in rows for block in row]
 
     logger.debug(f"横書きテキストブロックのソート完了: {len(result)} 個")
     return result
@@ -100,13 +185,11 @@ def calculate_group_bounding_box(text_blocks: List[TextBlock]) -> Tuple[float, f
 def sort_text_blocks_by_reading_order(page_result: PageOCRResult) -> PageOCRResult:
     logger = logging.getLogger(__name__)
 
-    if not page_result.text_blocks:
+    if not page_result.text_count:
         logger.debug("テキストブロックがないため、ソートをスキップします")
         return page_result
 
-    logger.info(
-        f"ページ {page_result.page_number}: テキストブロック読み順ソートを開始 ({len(page_result.text_blocks)} 個)"
-    )
+    logger.info(f"ページ {page_result.page_number}: テキストブロック読み順ソートを開始 ({page_result.text_count} 個)")
 
     merged_text_blocks = merge_overlapping_text_blocks(page_result.text_blocks)
 
@@ -147,7 +230,7 @@ def sort_text_blocks_by_reading_order(page_result: PageOCRResult) -> PageOCRResu
 
     logger.info(f"ページ {page_result.page_number}: テキストブロック読み順ソート完了 ({len(final_sorted_blocks)} 個)")
 
-    return PageOCRResult(
+    return PageOCRResult.from_text_blocks(
         page_number=page_result.page_number,
         text_blocks=final_sorted_blocks,
         page_width=page_result.page_width,
@@ -159,22 +242,37 @@ def sort_text_blocks_by_reading_order(page_result: PageOCRResult) -> PageOCRResu
 
 
 def calculate_overlap_ratio(bbox1, bbox2) -> float:
-    lx1, ty1, rx1, by1, _, _, w1, h1 = get_bbox_props(bbox1)
-    lx2, ty2, rx2, by2, _, _, w2, h2 = get_bbox_props(bbox2)
+    # 離れているブロック同士（比較の大半）は、重複領域を計算する前に座標の比較だけで判定する
+    if bbox1.x0 >= bbox2.x1 or bbox2.x0 >= bbox1.x1 or bbox1.y0 >= bbox2.y1 or bbox2.y0 >= bbox1.y1:
+        return 0.0
 
-    overlap_left, overlap_top = max(lx1, lx2), max(ty1, ty2)
-    overlap_right, overlap_bottom = min(rx1, rx2), min(by1, by2)
+    overlap_left, overlap_top = max(bbox1.x0, bbox2.x0), max(bbox1.y0, bbox2.y0)
+    overlap_right, overlap_bottom = min(bbox1.x1, bbox2.x1), min(bbox1.y1, bbox2.y1)
 
     if overlap_left >= overlap_right or overlap_top >= overlap_bottom:
         return 0.0
 
     overlap_area = (overlap_right - overlap_left) * (overlap_bottom - overlap_top)
-    area1, area2 = w1 * h1, w2 * h2
-    smaller_area = min(area1, area2)
+    smaller_area = min(bbox1.area, bbox2.area)
 
     return overlap_area / smaller_area if smaller_area > 0 else 0.0
 
 
+def calculate_overlap_ratios(bbox: np.ndarray, bboxes: np.ndarray) -> np.ndarray:
+    # calculate_overlap_ratioを、1つのbboxと複数のbbox（(N, 4)の配列）の間でまとめて計算する
+    overlap_width = np.minimum(bbox[2], bboxes[:, 2]) - np.maximum(bbox[0], bboxes[:, 0])
+    overlap_height = np.minimum(bbox[3], bboxes[:, 3]) - np.maximum(bbox[1], bboxes[:, 1])
+    overlaps = (overlap_width > 0) & (overlap_height > 0)
+
+    area = (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
+    smaller_areas = np.minimum(area, (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1]))
+    valid = overlaps & (smaller_areas > 0)
+
+    ratios = np.zeros(len(bboxes))
+    np.divide(overlap_width * overlap_height, smaller_areas, out=ratios, where=valid)
+    return ratios
+
+
 def merge_overlapping_text_blocks(text_blocks: List[TextBlock], overlap_threshold: float = 0.5) -> List[TextBlock]:
     logger = logging.getLogger(__name__)
 
@@ -183,35 +281,40 @@ def merge_overlapping_text_blocks(text_blocks: List[TextBlock], overlap_threshol
 
     logger.debug(f"重複テキストブロックのマージを開始: {len(text_blocks)} 個")
 
-    merged_blocks, used_indices = [], set()
+    # 各ブロックと後続の全ブロックとの重複率は配列演算でまとめて計算する
+    # （マージ対象の選び方は従来どおり、先頭から順に未使用のブロックを基準として同じ方向のブロックを集める）
+    bboxes = np.array([(b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1) for b in text_blocks], dtype=np.float64)
+    directions = np.array([b.direction for b in text_blocks])
+    used = np.zeros(len(text_blocks), dtype=bool)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    merged_blocks = []
 
     for i, block1 in enumerate(text_blocks):
-        if i in used_indices:
+        if used[i]:
             continue
+        used[i] = True
 
-        merge_candidates, merge_indices = [block1], {i}
-
-        for j, block2 in enumerate(text_blocks):
-            if j <= i or j in used_indices or block1.direction != block2.direction:
-                continue
+        rest = slice(i + 1, None)
+        overlap_ratios = calculate_overlap_ratios(bboxes[i], bboxes[rest])
+        is_candidate = (overlap_ratios >= overlap_threshold) & ~used[rest] & (directions[rest] == block1.direction)
+        merge_indices = np.flatnonzero(is_candidate)
 
-            overlap_ratio = calculate_overlap_ratio(block1.bbox, block2.bbox)
+        if merge_indices.size == 0:
+            merged_blocks.append(block1)
+            continue
 
-            if overlap_ratio >= overlap_threshold:
-                merge_candidates.append(block2)
-                merge_indices.add(j)
+        used[merge_indices + i + 1] = True
+        merge_candidates = [block1] + [text_blocks[j] for j in (merge_indices + i + 1).tolist()]
+        if debug:
+            for block2, overlap_ratio in zip(merge_candidates[1:], overlap_ratios[merge_indices].tolist()):
                 logger.debug(
                     f"ブロック {block1.block_id} と {block2.block_id} をマージ対象に追加 (重複率: {overlap_ratio:.2f})"
                 )
 
-        if len(merge_candidates) > 1:
-            merged_block = merge_text_blocks(merge_candidates)
-            merged_blocks.append(merged_block)
-            used_indices.update(merge_indices)
+        merged_block = merge_text_blocks(merge_candidates)
+        merged_blocks.append(merged_block)
+        if debug:
             logger.debug(f"{len(merge_candidates)} 個のブロックをマージして新ブロック {merged_block.block_id} を作成")
-        else:
-            merged_blocks.append(block1)
-            used_indices.add(i)
 
     logger.debug(f"重複テキストブロックのマージ完了: {len(text_blocks)} → {len(merged_blocks)} 個")
     return merged_blocks
@@ -240,11 +343,43 @@ def merge_text_blocks(text_blocks: List[TextBlock]) -> TextBlock:
     )
 
 
-def sort_document_text_blocks(document_result) -> None:
+def sort_document_text_blocks(document_result, max_workers: Optional[int] = None) -> None:
+    # ページごとのソートは互いに独立しているため、ページ数が多い場合は複数プロセスで並列に行う
+    # （ソート処理の大半はPythonのオブジェクト操作でGILを解放しないため、スレッドではなくプロセスを使用する）
     logger = logging.getLogger(__name__)
     logger.info(f"文書全体のテキストブロック読み順ソートを開始: {len(document_result.pages)} ページ")
 
-    for i, page_result in enumerate(document_result.pages):
-        document_result.pages[i] = sort_text_blocks_by_reading_order(page_result)
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, SORT_WORKERS_MAX)
+    if max_workers > 1 and len(document_result.pages) >= SORT_PARALLEL_MIN_PAGES:
+        logger.debug(f"{max_workers}プロセスでテキストブロックをソートします")
+        chunksize = max(1, len(document_result.pages) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            document_result.pages = list(
+                executor.map(sort_text_blocks_by_reading_order, document_result.pages, chunksize=chunksize)
+            )
+    else:
+        for i, page_result in enumerate(document_result.pages):
+            document_result.pages[i] = sort_text_blocks_by_reading_order(page_result)
 
     logger.info("文書全体のテキストブロック読み順ソート完了")
+
+
+def iter_sorted_pages(pages: Iterable[PageOCRResult], max_workers: Optional[int] = None) -> Iterator[PageOCRResult]:
+    # ページを順に読み順ソートして返す（全ページを同時に保持せず、一定ページ数ずつまとめて並列にソートする）
+    # 最初のまとまりがSORT_PARALLEL_MIN_PAGESに満たない場合は、文書全体が小さいためプロセスを起動しない
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, SORT_WORKERS_MAX)
+    page_iter = iter(pages)
+    batch_size = max(SORT_PARALLEL_MIN_PAGES, max_workers * SORT_STREAM_PAGES_PER_WORKER)
+    batch = list(islice(page_iter, batch_size))
+    if max_workers <= 1 or len(batch) < SORT_PARALLEL_MIN_PAGES:
+        for page_result in chain(batch, page_iter):
+            yield sort_text_blocks_by_reading_order(page_result)
+        return
+
+    chunksize = max(1, batch_size // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while batch:
+            yield from executor.map(sort_text_blocks_by_reading_order, batch, chunksize=chunksize)
+            batch = list(islice(page_iter, batch_size))